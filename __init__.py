@@ -13,6 +13,11 @@ import importlib
 
 
 module_names = (
+    "topology",
+    "uv_islands",
+    "live_tweak",
+    "palette",
+    "ambient_occlusion",
     "ui",
     "operators",
     "preferences"
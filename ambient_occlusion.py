@@ -0,0 +1,339 @@
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+
+import numpy as np
+
+import bpy
+from bpy.app.handlers import persistent
+from bpy.types import Object, Mesh, Depsgraph
+from mathutils.bvhtree import BVHTree
+
+from .color_buffer import ColorBuffer
+from .colorspace import linear_to_srgb
+from .functions import get_view3d_override, tag_view3d_redraw
+from .constants import AO_BATCH_SIZE, AO_RAY_BIAS
+
+
+def get_world_coords(ob: Object, data: Mesh) -> np.ndarray:
+    coords = np.empty((len(data.vertices), 3), dtype=np.float32)
+    data.vertices.foreach_get("co", coords.ravel())
+    matrix = np.array(ob.matrix_world, dtype=np.float64)
+    return coords @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def get_world_normals(ob: Object, normals: np.ndarray) -> np.ndarray:
+    """Transform normals to world space, degenerate
+    normals point up so they still have a hemisphere."""
+    normal_matrix = np.array(
+        ob.matrix_world.to_3x3().inverted_safe().transposed(),
+        dtype=np.float64
+    )
+    normals = normals @ normal_matrix.T
+    lengths = np.linalg.norm(normals, axis=1)
+    degenerate = lengths == 0.0
+    normals[degenerate] = (0.0, 0.0, 1.0)
+    lengths[degenerate] = 1.0
+    return normals / lengths[:, None]
+
+
+def get_corner_normals(data: Mesh) -> np.ndarray:
+    normals = np.empty((len(data.loops), 3), dtype=np.float32)
+    if bpy.app.version < (4, 1, 0):
+        data.calc_normals_split()
+        data.loops.foreach_get("normal", normals.ravel())
+    else:
+        data.corner_normals.foreach_get("vector", normals.ravel())
+    return normals
+
+
+def build_occluder_tree(targets: list[Object], depsgraph: Depsgraph,
+                        occluders: list[Object]=()) -> BVHTree:
+    """Build a world space BVH tree of the target meshes
+    and the evaluated meshes of any extra occluders.
+
+    Requires object mode data."""
+    coords = []
+    triangles = []
+    vert_offset = 0
+
+    def add_mesh(ob: Object, data: Mesh):
+        nonlocal vert_offset
+        data.calc_loop_triangles()
+        mesh_triangles = np.empty((len(data.loop_triangles), 3), dtype=np.int64)
+        data.loop_triangles.foreach_get("vertices", mesh_triangles.ravel())
+        coords.append(get_world_coords(ob, data))
+        triangles.append(mesh_triangles + vert_offset)
+        vert_offset += len(data.vertices)
+
+    for ob in targets:
+        add_mesh(ob, ob.data)
+    for ob in occluders:
+        ob_eval = ob.evaluated_get(depsgraph)
+        try:
+            add_mesh(ob_eval, ob_eval.to_mesh())
+        finally:
+            ob_eval.to_mesh_clear()
+
+    return BVHTree.FromPolygons(
+        np.concatenate(coords).tolist(),
+        np.concatenate(triangles).tolist(),
+        all_triangles=True
+    )
+
+
+def hemisphere_directions(normals: np.ndarray, count: int,
+                          rng: np.random.Generator) -> np.ndarray:
+    """Get `count` cosine weighted directions around every normal."""
+    u1 = rng.random((len(normals), count))
+    u2 = rng.random((len(normals), count))
+    radius = np.sqrt(u1)
+    angle = 2.0 * np.pi * u2
+
+    helper = np.zeros_like(normals)
+    use_x = np.abs(normals[:, 0]) < 0.9
+    helper[use_x, 0] = 1.0
+    helper[~use_x, 1] = 1.0
+    tangents = np.cross(helper, normals)
+    tangents /= np.linalg.norm(tangents, axis=1)[:, None]
+    bitangents = np.cross(normals, tangents)
+
+    return (radius * np.cos(angle))[..., None] * tangents[:, None] \
+        + (radius * np.sin(angle))[..., None] * bitangents[:, None] \
+        + np.sqrt(1.0 - u1)[..., None] * normals[:, None]
+
+
+_executor = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    # NOTE: mathutils ray casts hold the GIL, more threads would
+    # only compete for it. The worker just keeps bakes off the
+    # main thread so Blender stays responsive.
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="color_plus_ao"
+        )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+class AOBake:
+    """Ambient occlusion bake of an object's active color attribute.
+
+    Sample points are baked in batches on a worker thread, batches
+    only touch numpy arrays and the BVH tree. Face corners of a
+    vertex that share a normal share a sample. `finish` writes the
+    result and has to be called from the main thread."""
+
+    def __init__(self, ob: Object, buffer: ColorBuffer, tree: BVHTree,
+                 samples: int, distance: float):
+        self.object_name = ob.name
+        self.attribute_name = buffer.name
+        self.element_count = len(buffer)
+        self.tree = tree
+        self.samples = samples
+        self.distance = distance
+        # NOTE: Python's `hash()` is salted per process,
+        # crc32 gives the same rays on every run
+        self.seed = zlib.crc32(ob.name.encode())
+
+        data = buffer.data
+        coords = get_world_coords(ob, data)
+        if buffer.is_corner:
+            normals = get_world_normals(ob, get_corner_normals(data))
+            _keys, sample_element, self.element_sample = np.unique(
+                np.column_stack((buffer.loop_vert, normals)),
+                axis=0, return_index=True, return_inverse=True
+            )
+            self.element_sample = self.element_sample.ravel()
+            self.points = coords[buffer.loop_vert[sample_element]]
+            self.normals = normals[sample_element]
+        else: # Vert
+            normals = np.empty((len(data.vertices), 3), dtype=np.float32)
+            data.vertex_normals.foreach_get("vector", normals.ravel())
+            self.element_sample = np.arange(self.element_count)
+            self.points = coords
+            self.normals = get_world_normals(ob, normals)
+
+        self.visibility = np.ones(len(self.points))
+        self.cancelled = threading.Event()
+        self.futures: list[Future] = [
+            get_executor().submit(self.bake_batch, start)
+            for start in range(0, len(self.points), AO_BATCH_SIZE)
+        ]
+
+    @property
+    def progress(self) -> float:
+        if not self.futures:
+            return 1.0
+        return sum(future.done() for future in self.futures) / len(self.futures)
+
+    @property
+    def is_done(self) -> bool:
+        return all(future.done() for future in self.futures)
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+        for future in self.futures:
+            future.cancel()
+
+    def wait(self) -> None:
+        wait(self.futures)
+
+    def bake_batch(self, start: int) -> None:
+        """Cast the rays of one batch of sample points."""
+        stop = min(start + AO_BATCH_SIZE, len(self.points))
+        normals = self.normals[start:stop]
+        rng = np.random.default_rng((self.seed, start))
+        directions = hemisphere_directions(normals, self.samples, rng)
+        origins = self.points[start:stop] + normals * AO_RAY_BIAS
+
+        ray_cast = self.tree.ray_cast
+        distance = self.distance
+        for idx, (origin, point_directions) in enumerate(
+                zip(origins.tolist(), directions.tolist()), start):
+            if self.cancelled.is_set():
+                return
+            hits = 0
+            for direction in point_directions:
+                if ray_cast(origin, direction, distance)[0] is not None:
+                    hits += 1
+            self.visibility[idx] = 1.0 - hits / self.samples
+
+    def finish(self) -> bool:
+        """Write the baked colors, False if the object
+        or its attribute changed too much to apply them.
+
+        Requires object mode."""
+        # NOTE: Raise any exception from the batches
+        for future in self.futures:
+            future.result()
+
+        ob = bpy.data.objects.get(self.object_name)
+        if ob is None or ob.type != 'MESH':
+            return False
+        attribute = ob.data.color_attributes.get(self.attribute_name)
+        if attribute is None or len(attribute.data) != self.element_count:
+            return False
+
+        buffer = ColorBuffer(ob.data, attribute)
+        colors = np.ones((self.element_count, 4))
+        colors[:, :3] = self.visibility[self.element_sample, None]
+        if buffer.color_prop == "color_srgb":
+            colors = linear_to_srgb(colors)
+        buffer.colors[:] = colors
+        buffer.write()
+        return True
+
+
+class COLORPLUS_ao_bakes:
+    """Tracks running `AOBake`s and finishes them from a timer."""
+    _bakes = {}
+
+    @classmethod
+    def start(cls, bake: AOBake) -> None:
+        """Start tracking a bake, cancelling any
+        running bake of the same object."""
+        previous_bake = cls._bakes.get(bake.object_name)
+        if previous_bake is not None:
+            previous_bake.cancel()
+        cls._bakes[bake.object_name] = bake
+        if not bpy.app.timers.is_registered(ao_bake_timer):
+            bpy.app.timers.register(ao_bake_timer)
+
+    @classmethod
+    def get(cls, ob: Object) -> AOBake | None:
+        return cls._bakes.get(ob.name)
+
+    @classmethod
+    def cancel(cls, ob: Object | None=None) -> None:
+        if ob is None:
+            bakes = list(cls._bakes.values())
+            cls._bakes.clear()
+        else:
+            bakes = [cls._bakes.pop(ob.name)] if ob.name in cls._bakes else []
+        for bake in bakes:
+            bake.cancel()
+        tag_view3d_redraw()
+
+    @classmethod
+    def tick(cls) -> float | None:
+        finished = False
+        for name, bake in list(cls._bakes.items()):
+            if not bake.is_done:
+                continue
+            # NOTE: Edit mode would overwrite the colors when it
+            # exits, so wait until the object leaves it
+            ob = bpy.data.objects.get(name)
+            if ob is not None and ob.mode == 'EDIT':
+                continue
+            del cls._bakes[name]
+            finished |= bake.finish()
+
+        if finished:
+            preferences = \
+                bpy.context.preferences.addons[__package__].preferences
+            with bpy.context.temp_override(**get_view3d_override()):
+                bpy.ops.ed.undo_push(message="Bake Ambient Occlusion")
+                if preferences.auto_palette_refresh \
+                and bpy.context.object is not None:
+                    bpy.ops.color_plus.refresh_palette_outliner()
+        tag_view3d_redraw()
+        if not cls._bakes:
+            return None
+        return .1
+
+
+# NOTE: Timers are matched by function identity,
+# bound classmethods are a new object on every access
+def ao_bake_timer() -> float | None:
+    return COLORPLUS_ao_bakes.tick()
+
+
+@persistent
+def load_post_handler(_dummy) -> None:
+    COLORPLUS_ao_bakes.cancel()
+
+
+##################################
+# REGISTRATION
+##################################
+
+
+def register():
+    bpy.app.handlers.load_post.append(load_post_handler)
+
+def unregister():
+    if load_post_handler in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(load_post_handler)
+    COLORPLUS_ao_bakes.cancel()
+    if bpy.app.timers.is_registered(ao_bake_timer):
+        bpy.app.timers.unregister(ao_bake_timer)
+    shutdown_executor()
+
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
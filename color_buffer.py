@@ -0,0 +1,202 @@
+import numpy as np
+
+from bpy.types import Mesh, Object, Attribute
+
+from .functions import get_active_color, create_color
+from .topology import MeshTopology, get_topology
+
+
+class ColorBuffer:
+    """NumPy copy of a color attribute and the mesh index arrays
+    needed to work on it without building a `BMesh`.
+
+    Colors are stored as a contiguous float32 `(N, 4)` array, where
+    N is the number of elements in the attribute domain. Index arrays
+    are read lazily with `foreach_get` the first time they're used."""
+
+    def __init__(self, data: Mesh, attribute: Attribute):
+        self.data = data
+        self.name = attribute.name
+        self.domain = attribute.domain
+        # NOTE: BMesh exposes byte colors in sRGB, use the
+        # same values so colors compare equal to the palette
+        if attribute.data_type == 'BYTE_COLOR':
+            self.color_prop = "color_srgb"
+        else:
+            self.color_prop = "color"
+        self.colors = np.empty((len(attribute.data), 4), dtype=np.float32)
+        attribute.data.foreach_get(self.color_prop, self.colors.ravel())
+
+        self._topology = None
+        self._vert_select = None
+        self._face_select = None
+
+    @classmethod
+    def from_mesh(cls, data: Mesh, create: bool=False):
+        """Get a buffer for the active color attribute of a `Mesh`.
+
+        Returns None if there is no active color attribute
+        and `create` is False. Requires object mode data."""
+        attribute = get_active_color(data)
+        if attribute is None:
+            if not create:
+                return None
+            attribute = create_color(data)
+        return cls(data, attribute)
+
+    @classmethod
+    def from_object(cls, ob: Object, create: bool=False):
+        """Same as `from_mesh` but syncs edit mode changes first.
+
+        Only use this for reading, writes from edit mode
+        are overwritten when the edit mesh is flushed."""
+        if ob.mode == 'EDIT':
+            ob.update_from_editmode()
+        return cls.from_mesh(ob.data, create)
+
+    def __len__(self) -> int:
+        return len(self.colors)
+
+    @property
+    def is_corner(self) -> bool:
+        return self.domain == 'CORNER'
+
+    @property
+    def topology(self) -> MeshTopology:
+        if self._topology is None:
+            self._topology = get_topology(self.data)
+        return self._topology
+
+    @property
+    def loop_vert(self) -> np.ndarray:
+        """Vertex index of every loop."""
+        return self.topology.loop_vert
+
+    @property
+    def loop_face(self) -> np.ndarray:
+        """Face index of every loop."""
+        return self.topology.loop_face
+
+    @property
+    def vert_select(self) -> np.ndarray:
+        if self._vert_select is None:
+            self._vert_select = \
+                np.empty(len(self.data.vertices), dtype=bool)
+            self.data.vertices.foreach_get("select", self._vert_select)
+        return self._vert_select
+
+    @property
+    def face_select(self) -> np.ndarray:
+        if self._face_select is None:
+            self._face_select = \
+                np.empty(len(self.data.polygons), dtype=bool)
+            self.data.polygons.foreach_get("select", self._face_select)
+        return self._face_select
+
+    @property
+    def element_vert(self) -> np.ndarray:
+        """Vertex index of every element in the attribute domain."""
+        if self.is_corner:
+            return self.loop_vert
+        return np.arange(len(self.colors), dtype=np.int32)
+
+    def vertex_colors(self) -> np.ndarray:
+        """Colors averaged to vertices.
+
+        Corners are averaged with equal weight, vertices
+        without any corners are black and transparent."""
+        if not self.is_corner:
+            return self.colors
+        vert_count = self.topology.vert_count
+        colors = np.empty((vert_count, 4), dtype=np.float32)
+        for channel in range(4):
+            colors[:, channel] = np.bincount(
+                self.loop_vert, weights=self.colors[:, channel],
+                minlength=vert_count
+            )
+        corner_count = np.bincount(self.loop_vert, minlength=vert_count)
+        colors /= np.maximum(corner_count, 1)[:, None]
+        return colors
+
+    def selected(self) -> np.ndarray:
+        """Mask of elements whose vertex is selected."""
+        return self.vert_select[self.element_vert]
+
+    def match(self, color) -> np.ndarray:
+        """Mask of elements exactly matching a given color."""
+        color = np.asarray(color[:4], dtype=np.float32)
+        return np.all(self.colors == color, axis=1)
+
+    def vertices(self, mask: np.ndarray) -> np.ndarray:
+        """Sorted unique vertex indices of the masked elements.
+
+        The mask can be a boolean mask or an array of indices."""
+        return np.unique(self.element_vert[mask])
+
+    def quantize(self) -> None:
+        """Round the colors of a byte color attribute to the values it
+        stores, so they match what the next read of the attribute gives."""
+        if self.color_prop != "color_srgb":
+            return
+        # NOTE: Same rounding as Blender's float to byte conversion
+        np.clip(self.colors, 0.0, 1.0, out=self.colors)
+        self.colors *= 255.0
+        self.colors += 0.5
+        np.floor(self.colors, out=self.colors)
+        self.colors /= 255.0
+
+    def write(self) -> None:
+        """Write the colors back to the attribute.
+
+        Requires object mode."""
+        self.quantize()
+        attribute = self.data.color_attributes[self.name]
+        attribute.data.foreach_set(self.color_prop, self.colors.ravel())
+        self.data.update()
+
+
+def set_vertex_selection(data: Mesh, vert_select: np.ndarray) -> None:
+    """Select vertices and flush the selection to edges and faces.
+    Hidden elements are never selected, like `BMVert.select_set`.
+
+    Requires object mode."""
+    topology = get_topology(data)
+    vert_hide = np.empty(topology.vert_count, dtype=bool)
+    data.vertices.foreach_get("hide", vert_hide)
+    edge_hide = np.empty(topology.edge_count, dtype=bool)
+    data.edges.foreach_get("hide", edge_hide)
+    face_hide = np.empty(topology.face_count, dtype=bool)
+    data.polygons.foreach_get("hide", face_hide)
+
+    vert_select = vert_select & ~vert_hide
+    edge_select = vert_select[topology.edge_verts].all(axis=1) & ~edge_hide
+
+    face_select = np.zeros(len(data.polygons), dtype=bool)
+    if len(data.polygons):
+        face_select = np.logical_and.reduceat(
+            vert_select[topology.loop_vert], topology.face_loop_start
+        ) & ~face_hide
+
+    data.vertices.foreach_set("select", vert_select)
+    data.edges.foreach_set("select", edge_select)
+    data.polygons.foreach_set("select", face_select)
+    data.update()
+
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
@@ -0,0 +1,329 @@
+import numpy as np
+
+
+# NOTE: All conversions take arrays of colors with the channels on
+# the last axis, e.g. (N, 3) or (N, 4). A 4th channel is treated as
+# alpha and passed through. Conversions are done in double precision
+# and the RGB/HSV/HSL ones follow the same steps as `colorsys`
+# so the results match it exactly.
+
+
+ONE_THIRD = 1.0 / 3.0
+ONE_SIXTH = 1.0 / 6.0
+TWO_THIRD = 2.0 / 3.0
+
+# Linear Rec. 709 RGB to CIE XYZ, D65 white point
+RGB_TO_XYZ = np.array((
+    (0.4124564, 0.3575761, 0.1804375),
+    (0.2126729, 0.7151522, 0.0721750),
+    (0.0193339, 0.1191920, 0.9503041)
+))
+XYZ_TO_RGB = np.linalg.inv(RGB_TO_XYZ)
+D65_WHITE = np.array((0.95047, 1.0, 1.08883))
+
+# NOTE: RGB/HSV convert this many colors at a time, the
+# temporaries are reused per block and stay in the CPU cache
+HSV_BLOCK_SIZE = 16384
+
+# Row of v, p, q or t each RGB channel takes per hue sector
+HSV_SECTOR_SOURCES = np.array((
+    (0, 2, 1, 1, 3, 0),
+    (3, 0, 0, 2, 1, 1),
+    (1, 1, 3, 0, 0, 2)
+))
+
+
+def _split_channels(colors) -> tuple[np.ndarray, ...]:
+    """Get the colors as a double array and views
+    of their first 3 channels, flattened to one dimension."""
+    colors = np.asarray(colors, dtype=np.float64)
+    flat_colors = colors.reshape(-1, colors.shape[-1])
+    return colors, flat_colors[:, 0], flat_colors[:, 1], flat_colors[:, 2]
+
+
+def _merge_channels(colors: np.ndarray, *channels: np.ndarray) -> np.ndarray:
+    """Stack converted channels, keeping the alpha of `colors`."""
+    result = np.empty((len(channels[0]), colors.shape[-1]), dtype=np.float64)
+    for idx, channel in enumerate(channels):
+        result[:, idx] = channel
+    if colors.shape[-1] > 3:
+        result[:, 3:] = colors.reshape(-1, colors.shape[-1])[:, 3:]
+    return result.reshape(colors.shape)
+
+
+def _mod1(x: np.ndarray) -> np.ndarray:
+    """Python's `x % 1.0`, much faster than `numpy.mod` for floats."""
+    return x - np.floor(x)
+
+
+def _hue(r: np.ndarray, g: np.ndarray, b: np.ndarray,
+         maxc: np.ndarray, rangec: np.ndarray) -> np.ndarray:
+    """Hue shared by HSV and HSL, `rangec` must not be zero."""
+    rc = (maxc - r) / rangec
+    gc = (maxc - g) / rangec
+    bc = (maxc - b) / rangec
+
+    r_max = r == maxc
+    h = bc - gc
+    np.copyto(h, 2.0 + rc - bc, where=~r_max & (g == maxc))
+    np.copyto(h, 4.0 + gc - rc, where=(r != maxc) & (g != maxc))
+    return _mod1(h / 6.0)
+
+
+def _convert_blocks(colors, convert) -> np.ndarray:
+    """Convert the first 3 channels of the colors in blocks, keeping
+    the alpha. `convert(block, converted, work, flat_index)` gets
+    planar (3, N) blocks, a contiguous (5, N) float and an N int
+    scratch array, all of them reused for the next block."""
+    colors = np.asarray(colors, dtype=np.float64)
+    flat_colors = colors.reshape(-1, colors.shape[-1])
+    result = np.empty_like(flat_colors)
+    result[:, 3:] = flat_colors[:, 3:]
+
+    count = 0
+    for start in range(0, len(flat_colors), HSV_BLOCK_SIZE):
+        stop = min(start + HSV_BLOCK_SIZE, len(flat_colors))
+        if stop - start != count:
+            count = stop - start
+            block = np.empty((3, count))
+            converted = np.empty((3, count))
+            work = np.empty((5, count))
+            flat_index = np.empty(count, dtype=np.intp)
+        # NOTE: Copying channel by channel is faster
+        # than one transposed copy of the block
+        for channel in range(3):
+            block[channel] = flat_colors[start:stop, channel]
+        convert(block, converted, work, flat_index)
+        for channel in range(3):
+            result[start:stop, channel] = converted[channel]
+    return result.reshape(colors.shape)
+
+
+def _rgb_to_hsv_block(rgb: np.ndarray, hsv: np.ndarray,
+                      work: np.ndarray, flat_index: np.ndarray) -> None:
+    r, g, b = rgb
+    h, s, v = hsv
+    maxc, rangec = work[3:]
+    np.maximum(r, g, out=maxc)
+    np.maximum(maxc, b, out=maxc)
+    np.minimum(r, g, out=rangec)
+    np.minimum(rangec, b, out=rangec)
+    np.subtract(maxc, rangec, out=rangec)
+    v[:] = maxc
+
+    # NOTE: Grays are handled without branches. Black divides by one
+    # so its saturation is zero, grays get a range of one so every
+    # channel distance and the hue are zero
+    np.equal(maxc, 0.0, out=s)
+    s += maxc
+    np.divide(rangec, s, out=s)
+    np.equal(rangec, 0.0, out=h)
+    rangec += h
+
+    # NOTE: Pick the hue of the maximum channel, red
+    # before green before blue, from the flat work rows
+    count = len(flat_index)
+    not_r = r != maxc
+    hue_row = not_r.view(np.uint8) + (not_r & (g != maxc)).view(np.uint8)
+    np.copyto(flat_index, hue_row)
+    flat_index *= count
+    flat_index += np.arange(count)
+
+    # NOTE: rc, gc and bc overwrite the channels
+    rgb = np.subtract(maxc, rgb, out=rgb)
+    rgb /= rangec
+    rc, gc, bc = rgb
+    np.subtract(bc, gc, out=work[0])
+    np.add(2.0, rc, out=work[1])
+    work[1] -= bc
+    np.add(4.0, gc, out=work[2])
+    work[2] -= rc
+    np.take(work.ravel(), flat_index, mode='clip', out=h)
+    h /= 6.0
+    np.floor(h, out=maxc)
+    h -= maxc
+
+
+def rgb_to_hsv(colors) -> np.ndarray:
+    return _convert_blocks(colors, _rgb_to_hsv_block)
+
+
+def _hsv_to_rgb_block(hsv: np.ndarray, rgb: np.ndarray,
+                      work: np.ndarray, flat_index: np.ndarray) -> None:
+    h, s, v = hsv
+    p, q, t, h6 = work[1:]
+    work[0] = v
+    np.multiply(h, 6.0, out=h6)
+    i = h6.astype(np.intp)
+    # NOTE: f, then q and t in the same steps as `colorsys`
+    np.trunc(h6, out=q)
+    np.subtract(h6, q, out=q)
+    np.subtract(1.0, q, out=t)
+    t *= s
+    np.subtract(1.0, t, out=t)
+    t *= v
+    q *= s
+    np.subtract(1.0, q, out=q)
+    q *= v
+    np.subtract(1.0, s, out=p)
+    p *= v
+
+    # NOTE: Gather every channel from the flat v, p, q, t rows instead
+    # of `numpy.choose`, `mode='wrap'` is Python's `i % 6`. With zero
+    # saturation p, q and t are exactly v so grays need no fix
+    count = len(flat_index)
+    element = np.arange(count)
+    flat_sources = work.ravel()
+    for channel, rows in enumerate(HSV_SECTOR_SOURCES * count):
+        np.take(rows, i, mode='wrap', out=flat_index)
+        flat_index += element
+        np.take(flat_sources, flat_index, mode='clip', out=rgb[channel])
+
+
+def hsv_to_rgb(colors) -> np.ndarray:
+    return _convert_blocks(colors, _hsv_to_rgb_block)
+
+
+def rgb_to_hsl(colors) -> np.ndarray:
+    """Convert RGB to HSL, `colorsys.rgb_to_hls`
+    with the lightness as last channel."""
+    colors, r, g, b = _split_channels(colors)
+    maxc = np.maximum(np.maximum(r, g), b)
+    minc = np.minimum(np.minimum(r, g), b)
+    sumc = maxc + minc
+    rangec = maxc - minc
+    gray = minc == maxc
+    rangec[gray] = 1.0
+    l = sumc / 2.0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = rangec / sumc
+        np.copyto(s, rangec / (2.0 - maxc - minc), where=l > 0.5)
+    h = _hue(r, g, b, maxc, rangec)
+    s[gray] = 0.0
+    h[gray] = 0.0
+    return _merge_channels(colors, h, s, l)
+
+
+def _hsl_channel(m1: np.ndarray, m2: np.ndarray, hue: np.ndarray) -> np.ndarray:
+    hue = _mod1(hue)
+    channel = m1.copy()
+    np.copyto(
+        channel, m1 + (m2 - m1) * (TWO_THIRD - hue) * 6.0,
+        where=hue < TWO_THIRD
+    )
+    np.copyto(channel, m2, where=hue < 0.5)
+    np.copyto(channel, m1 + (m2 - m1) * hue * 6.0, where=hue < ONE_SIXTH)
+    return channel
+
+
+def hsl_to_rgb(colors) -> np.ndarray:
+    colors, h, s, l = _split_channels(colors)
+    m2 = l + s - (l * s)
+    np.copyto(m2, l * (1.0 + s), where=l <= 0.5)
+    m1 = 2.0 * l - m2
+
+    r = _hsl_channel(m1, m2, h + ONE_THIRD)
+    g = _hsl_channel(m1, m2, h)
+    b = _hsl_channel(m1, m2, h - ONE_THIRD)
+    gray = s == 0.0
+    r[gray] = g[gray] = b[gray] = l[gray]
+    return _merge_channels(colors, r, g, b)
+
+
+def srgb_to_linear(colors) -> np.ndarray:
+    colors, *channels = _split_channels(colors)
+    linear = []
+    for c in channels:
+        linear.append(np.where(
+            c < 0.04045,
+            np.maximum(c, 0.0) / 12.92,
+            ((np.maximum(c, 0.04045) + 0.055) / 1.055) ** 2.4
+        ))
+    return _merge_channels(colors, *linear)
+
+
+def linear_to_srgb(colors) -> np.ndarray:
+    colors, *channels = _split_channels(colors)
+    srgb = []
+    for c in channels:
+        srgb.append(np.where(
+            c < 0.0031308,
+            np.maximum(c, 0.0) * 12.92,
+            1.055 * np.maximum(c, 0.0031308) ** (1.0 / 2.4) - 0.055
+        ))
+    return _merge_channels(colors, *srgb)
+
+
+def linear_to_lab(colors) -> np.ndarray:
+    """Convert linear RGB to CIE L*a*b*."""
+    colors, *channels = _split_channels(colors)
+    xyz = (RGB_TO_XYZ @ np.stack(channels)) / D65_WHITE[:, None]
+
+    delta = 6.0 / 29.0
+    f = np.where(
+        xyz > delta ** 3,
+        np.cbrt(xyz),
+        xyz / (3.0 * delta ** 2) + 4.0 / 29.0
+    )
+    return _merge_channels(
+        colors,
+        116.0 * f[1] - 16.0,
+        500.0 * (f[0] - f[1]),
+        200.0 * (f[1] - f[2])
+    )
+
+
+def lab_to_linear(colors) -> np.ndarray:
+    colors, l, a, b = _split_channels(colors)
+    fy = (l + 16.0) / 116.0
+    f = np.stack((fy + a / 500.0, fy, fy - b / 200.0))
+
+    delta = 6.0 / 29.0
+    xyz = np.where(
+        f > delta, f ** 3, 3.0 * delta ** 2 * (f - 4.0 / 29.0)
+    ) * D65_WHITE[:, None]
+    return _merge_channels(colors, *(XYZ_TO_RGB @ xyz))
+
+
+def color_distance(colors, color, space: str='rgb') -> np.ndarray:
+    """Distance of every color to a single RGBA color.
+
+    'rgb' and 'hsv' are euclidean distances of RGBA and HSVA values,
+    with hue wrapping around. 'lab' is the CIE76 ΔE of linear colors
+    with alpha differences scaled to the same 0-100 range."""
+    colors = np.asarray(colors, dtype=np.float64).reshape(-1, 4)
+    color = np.asarray(color[:4], dtype=np.float64).reshape(1, 4)
+    if space == 'hsv':
+        colors = rgb_to_hsv(colors)
+        color = rgb_to_hsv(color)
+    elif space == 'lab':
+        colors = linear_to_lab(colors)
+        color = linear_to_lab(color)
+        colors[:, 3] *= 100.0
+        color[:, 3] *= 100.0
+
+    difference = np.abs(colors - color)
+    if space == 'hsv':
+        np.minimum(difference[:, 0], 1.0 - difference[:, 0],
+                   out=difference[:, 0])
+    return np.sqrt(np.einsum('ij,ij->i', difference, difference))
+
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
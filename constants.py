@@ -1,6 +1,18 @@
 
 BLANK_ARRAY = (1, 1, 1, 1)
-MAX_OUTLINER_ITEM_MSG = "Max # of colors in outliner"
+MAX_OUTLINER_ITEM_MSG = "Max # of colors per outliner page"
+# Seconds without a Live Tweak update before the palette refreshes
+LIVE_TWEAK_SETTLE_TIME = .25
+# Colors factorized per timer tick by the async palette refresh
+PALETTE_SCAN_CHUNK_SIZE = 1 << 18
+# UV distance below which face corners of a vertex are welded
+UV_WELD_EPSILON = 1e-5
+# Weight levels used when writing vertex groups in bulk
+VERTEX_WEIGHT_STEPS = 1 << 10
+# Sample points per worker task of the ambient occlusion bake
+AO_BATCH_SIZE = 1 << 9
+# Offset of ambient occlusion rays along the normal to avoid self hits
+AO_RAY_BIAS = 1e-4
 
 
 # ##### BEGIN GPL LICENSE BLOCK #####
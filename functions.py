@@ -1,7 +1,8 @@
 from typing import Iterable
 
+import bpy
 from bpy.types import Mesh, Attribute
-from bmesh.types import BMesh, BMLayerItem, BMLoop, BMVert
+from bmesh.types import BMesh, BMLayerItem
 
 
 def iterable_to_list(iterable: Iterable) -> list:
@@ -26,21 +27,16 @@ def public_color_exists(data: Mesh) -> bool:
     return True
 
 
-def create_color(data: Mesh, name: str="Color") -> Attribute:
+def create_color(data: Mesh, name: str="Color", domain: str='CORNER',
+                 data_type: str='BYTE_COLOR') -> Attribute:
     """Create color attribute from object mode."""
     color_attributes = data.color_attributes
     attribute = color_attributes.new(
-        name, type='BYTE_COLOR', domain='CORNER'
+        name, type=data_type, domain=domain
     )
     color_attributes.active_color_index = \
     color_attributes.render_color_index = len(color_attributes)-1
-    for idx in range(len(data.vertices)):
-        attribute.data[idx].color = [1, 1, 1, 1]
-    # NOTE: Alternatively, using foreach_set
-    #cols = []
-    #for idx in range(len(data.vertices)):
-    #   cols += [1, 1, 1, 1]
-    #attribute.data.foreach_set("color", cols)
+    attribute.data.foreach_set("color", [1.0] * (len(attribute.data) * 4))
     return attribute
 
 
@@ -89,30 +85,21 @@ def get_bmesh_active_color(
     return None, None
 
 
-def get_component_colors(
-        bm: BMesh, layer, layer_type: str, selected_only: bool=False
-    ) -> dict[BMLoop | BMVert, list]:
-    """Get all components (vert/edge/face) based on a given layer type.
-
-    Returns a dict of `BMLoop` or `BMVert` and the color."""
-    if layer_type == "loop":
-        loops = []
-        for face in bm.faces:
-            for loop in face.loops:
-                if not selected_only or loop.vert.select:
-                    loops.append(loop)
-        sequence = loops
-    else: # Verts
-        if selected_only:
-            sequence = [vert for vert in bm.verts if vert.select]
-        else:
-            sequence = bm.verts
-
-    components = {}
-    for component in sequence:
-        converted_color = iterable_to_list(component[layer])
-        components[component] = converted_color
-    return components
+def get_view3d_override() -> dict:
+    """Get a window and 3D View area for running operators
+    from places without one, like timers."""
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                return {"window": window, "area": area}
+    return {}
+
+
+def tag_view3d_redraw() -> None:
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
 
 
 def component_select(component, layer_type) -> bool:
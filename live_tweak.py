@@ -0,0 +1,195 @@
+import time
+
+import numpy as np
+
+import bpy
+from bpy.app.handlers import persistent
+
+from .functions import get_view3d_override
+from .constants import LIVE_TWEAK_SETTLE_TIME
+
+
+class COLORPLUS_selection_cache:
+    """Snapshots of the elements `edit_color` writes to during a
+    Live Tweak session, keyed by mesh `session_uid`.
+
+    The selection can't change while dragging a swatch, so the mask
+    is computed on the first tick and reused until the session ends,
+    the selection changes or an undo step is loaded."""
+    _snapshots = {}
+
+    @classmethod
+    def get(cls, data, key: tuple) -> np.ndarray | None:
+        snapshot = cls._snapshots.get(data.session_uid)
+        if snapshot is None or snapshot[0] != key:
+            return None
+        return snapshot[1]
+
+    @classmethod
+    def store(cls, data, key: tuple, mask: np.ndarray) -> np.ndarray:
+        """Store the selected element indices of a mask."""
+        elements = np.flatnonzero(mask)
+        cls._snapshots[data.session_uid] = (key, elements)
+        return elements
+
+    @classmethod
+    def invalidate(cls, session_uid: int | None=None) -> None:
+        if session_uid is None:
+            cls._snapshots.clear()
+        else:
+            cls._snapshots.pop(session_uid, None)
+
+
+class COLORPLUS_live_tweak:
+    """Coalesces Live Tweak color updates into a timer.
+
+    Swatch drags fire an update for every mouse move, so instead of
+    editing the mesh each time we store the requested variation and
+    apply the latest one at most `live_tweak_rate` times a second.
+    The palette refresh is deferred until the drag settles."""
+    _pending = []
+    _last_apply = 0.0
+    _last_request = 0.0
+    _needs_refresh = False
+
+    @classmethod
+    def get_interval(cls) -> float:
+        preferences = bpy.context.preferences.addons[__package__].preferences
+        return 1 / preferences.live_tweak_rate
+
+    @classmethod
+    def request(cls, variation_value: str) -> None:
+        """Queue an `edit_color` apply for the given variation."""
+        if variation_value not in cls._pending:
+            cls._pending.append(variation_value)
+        cls._last_request = time.perf_counter()
+
+        if bpy.app.timers.is_registered(live_tweak_timer):
+            return
+        elapsed = cls._last_request - cls._last_apply
+        bpy.app.timers.register(
+            live_tweak_timer,
+            first_interval=max(0, cls.get_interval() - elapsed)
+        )
+
+    @classmethod
+    def apply(cls) -> None:
+        override = get_view3d_override()
+        with bpy.context.temp_override(**override):
+            if bpy.context.mode not in ('EDIT_MESH', 'PAINT_VERTEX'):
+                return
+            for variation_value in cls._pending:
+                bpy.ops.color_plus.edit_color(
+                    edit_type='apply',
+                    variation_value=variation_value,
+                    palette_refresh=False,
+                    use_selection_cache=True
+                )
+        cls._needs_refresh = True
+
+    @classmethod
+    def refresh_palette(cls) -> None:
+        cls._needs_refresh = False
+        preferences = bpy.context.preferences.addons[__package__].preferences
+        if not preferences.auto_palette_refresh:
+            return
+        override = get_view3d_override()
+        with bpy.context.temp_override(**override):
+            if bpy.context.object is not None:
+                bpy.ops.color_plus.refresh_palette_outliner()
+
+    @classmethod
+    def tick(cls) -> float | None:
+        now = time.perf_counter()
+        if cls._pending:
+            try:
+                cls.apply()
+            finally:
+                cls._pending.clear()
+                cls._last_apply = now
+            return cls.get_interval()
+
+        # Wait for the drag to settle before refreshing the palette
+        settle_time = cls._last_request + LIVE_TWEAK_SETTLE_TIME - now
+        if settle_time > 0:
+            return max(settle_time, cls.get_interval())
+        COLORPLUS_selection_cache.invalidate()
+        if cls._needs_refresh:
+            cls.refresh_palette()
+        return None
+
+    @classmethod
+    def cancel(cls) -> None:
+        cls._pending.clear()
+        cls._needs_refresh = False
+        COLORPLUS_selection_cache.invalidate()
+        if bpy.app.timers.is_registered(live_tweak_timer):
+            bpy.app.timers.unregister(live_tweak_timer)
+
+
+# NOTE: Timers are matched by function identity,
+# bound classmethods are a new object on every access
+def live_tweak_timer() -> float | None:
+    return COLORPLUS_live_tweak.tick()
+
+
+@persistent
+def depsgraph_update_post_handler(_scene, depsgraph) -> None:
+    """Drop snapshots of meshes with a selection change.
+
+    Selection changes are tagged without a geometry update,
+    color writes from the tweak itself are geometry updates."""
+    if not COLORPLUS_selection_cache._snapshots:
+        return
+    for update in depsgraph.updates:
+        if not isinstance(update.id, bpy.types.Mesh) \
+        or update.is_updated_geometry:
+            continue
+        COLORPLUS_selection_cache.invalidate(update.id.original.session_uid)
+
+
+@persistent
+def undo_post_handler(_scene, _dummy=None) -> None:
+    COLORPLUS_selection_cache.invalidate()
+
+
+##################################
+# REGISTRATION
+##################################
+
+
+handlers = (
+    (bpy.app.handlers.depsgraph_update_post, depsgraph_update_post_handler),
+    (bpy.app.handlers.undo_post, undo_post_handler),
+    (bpy.app.handlers.redo_post, undo_post_handler),
+    (bpy.app.handlers.load_post, undo_post_handler)
+)
+
+def register():
+    for handler_list, handler in handlers:
+        handler_list.append(handler)
+
+def unregister():
+    for handler_list, handler in handlers:
+        if handler in handler_list:
+            handler_list.remove(handler)
+    COLORPLUS_live_tweak.cancel()
+
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
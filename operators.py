@@ -1,18 +1,45 @@
-import colorsys
-from random import random
+import zlib
+
+import numpy as np
 
 import bpy
-import bpy_extras
 import bmesh
 from bpy.types import Operator, Object, Context
-from bpy.props import FloatVectorProperty
 
 from .functions import (
     iterable_to_list,
     create_color,
-    get_active_color,
-    get_bmesh_active_color,
-    get_component_colors
+    get_bmesh_active_color
+)
+from .color_buffer import ColorBuffer, set_vertex_selection
+from .topology import (
+    get_border_loops,
+    get_label_border_loops,
+    get_mesh_island_labels
+)
+from .uv_islands import get_uv_island_labels
+from .vertex_groups import set_vertex_group_weights, get_vertex_group_weights
+from .vertex_dirt import get_vertex_dirt
+from .ambient_occlusion import AOBake, COLORPLUS_ao_bakes, build_occluder_tree
+from .live_tweak import COLORPLUS_selection_cache
+from .colorspace import (
+    hsv_to_rgb,
+    srgb_to_linear,
+    linear_to_srgb,
+    color_distance
+)
+from .palette import (
+    PaletteIndex,
+    build_palette_index,
+    get_palette_index,
+    lookup_color,
+    get_page_count,
+    format_color_names,
+    remap_colors,
+    read_remap_table,
+    is_palette_synced,
+    set_palette_synced,
+    COLORPLUS_palette_scans
 )
 from .constants import BLANK_ARRAY
 
@@ -81,33 +108,64 @@ class COLORPLUS_OT_edit_color(DefaultsOperator):
     ) # type: ignore
 
     variation_value: bpy.props.StringProperty(options={'HIDDEN'})
+    palette_refresh: bpy.props.BoolProperty(default=True, options={'HIDDEN'})
+    use_selection_cache: bpy.props.BoolProperty(options={'HIDDEN'})
+
+    def get_edit_mask(self, buffer: ColorBuffer, selected: bool) -> np.ndarray:
+        """Get a mask of the elements to edit based on the
+        selection and interpolation type."""
+        if not selected:
+            return np.ones(len(buffer), dtype=bool)
+
+        # Smooth (vert is required)
+        mask = buffer.selected()
+        # Hard (loop is required)
+        if bpy.context.scene.color_plus.interp_type == "hard":
+            if not buffer.is_corner:
+                self.report(
+                    {'WARNING'}, "Can't run hard interpolation on vertex domain color attribute"
+                )
+                return mask
+            mask &= buffer.face_select[buffer.loop_face]
+        return mask
+
+    def get_cached_edit_mask(self, buffer: ColorBuffer,
+                             selected: bool) -> np.ndarray:
+        """Same as `get_edit_mask` but returns the element indices
+        from the Live Tweak selection snapshot if there is one."""
+        key = (
+            buffer.name, buffer.domain, len(buffer),
+            selected, bpy.context.scene.color_plus.interp_type
+        )
+        elements = COLORPLUS_selection_cache.get(buffer.data, key)
+        if elements is None:
+            mask = self.get_edit_mask(buffer, selected)
+            elements = COLORPLUS_selection_cache.store(buffer.data, key, mask)
+        return elements
 
-    def change_color(self, component, layer, rgba_value) -> None:
-        """Change a vert/loop components color attribute."""
-        if self.edit_type in ('clear', 'clear_all'):
-            component[layer] = BLANK_ARRAY
-            return
-
-        for idx, value in enumerate(rgba_value):
-            if value is None:
-                rgba_value[idx] = component[layer][idx]
+    def change_color(self, colors: np.ndarray, mask: np.ndarray,
+                     rgba_value) -> None:
+        """Change the masked colors in place.
 
-        if self.variation_value == 'alpha_only':
-            component[layer] = (
-                component[layer][0], component[layer][1],
-                component[layer][2], rgba_value[3]
-            )
+        The mask can be a boolean mask or an array of indices."""
+        if self.edit_type in ('clear', 'clear_all'):
+            colors[mask] = BLANK_ARRAY
+        elif self.variation_value == 'alpha_only':
+            colors[mask, 3] = rgba_value[3]
         elif self.variation_value == 'color_only':
-            component[layer] = (
-                rgba_value[0], rgba_value[1],
-                rgba_value[2], component[layer][3]
-            )
+            colors[mask, :3] = rgba_value[:3]
         elif self.variation_value == 'visibility':
             color_plus = bpy.context.scene.color_plus
             vis_color = color_plus.material_visibility
-            component[layer] = (float(vis_color), 0, 0, 1)
+            colors[mask] = (float(vis_color), 0, 0, 1)
+        elif None not in rgba_value:
+            colors[mask] = rgba_value[:4]
         else:
-            component[layer] = rgba_value
+            # NOTE: None channels keep their existing value
+            channels = \
+                [idx for idx, value in enumerate(rgba_value) if value is not None]
+            colors[np.ix_(mask, channels)] = \
+                [rgba_value[idx] for idx in channels]
 
     def execute(self, context: Context):
         color_plus = context.scene.color_plus
@@ -128,6 +186,8 @@ class COLORPLUS_OT_edit_color(DefaultsOperator):
                     [rgba_value[0], rgba_value[1], rgba_value[2], None]
             elif self.variation_value == 'alpha_var':
                 rgba_value = [None, None, None, rgba_value[3]]
+            else:
+                rgba_value = iterable_to_list(rgba_value)
 
         # NOTE: if not using *_all edit_type use selected only
         selected = False
@@ -137,41 +197,28 @@ class COLORPLUS_OT_edit_color(DefaultsOperator):
         selected_mesh_objects = \
             [ob for ob in context.selected_objects if ob.type == 'MESH']
         for ob in selected_mesh_objects:
-            active_color = get_active_color(ob.data)
-            if active_color is None:
-                active_color = create_color(ob.data)
-
-            bm = bmesh.new()
-            bm.from_mesh(ob.data)
-            layer, layer_type = get_bmesh_active_color(bm, ob.data)
-            components = get_component_colors(bm, layer, layer_type, selected)
-            for component, _color in components.items():
-                # Smooth (vert is required)
-                if color_plus.interp_type == "smooth":
-                    if layer_type == "loop":
-                        for loop in component.vert.link_loops:
-                            self.change_color(loop, layer, rgba_value)
-                    else: # Vert
-                        self.change_color(component, layer, rgba_value)
-                # Hard (loop is required)
-                elif color_plus.interp_type == "hard":
-                    if layer_type != "loop" or active_color.domain != 'CORNER':
-                        self.report(
-                            {'WARNING'}, "Can't run hard interpolation on vertex domain color attribute"
-                        )
-                        for loop in component.vert.link_loops:
-                            self.change_color(loop, layer, rgba_value)
-                        continue
-                    if selected and component.face.select:
-                        for loop in component.face.loops:
-                            self.change_color(component, layer, rgba_value)
-            bm.to_mesh(ob.data)
+            buffer = ColorBuffer.from_mesh(ob.data, create=True)
+            if self.use_selection_cache:
+                mask = self.get_cached_edit_mask(buffer, selected)
+                if not len(mask):
+                    continue
+            else:
+                mask = self.get_edit_mask(buffer, selected)
+                if not mask.any():
+                    continue
+            # NOTE: Live Tweak ticks skip tracking, the
+            # palette is fully refreshed once they settle
+            index = get_palette_index(buffer) if self.palette_refresh else None
+            self.change_color(buffer.colors, mask, rgba_value)
+            buffer.write()
+            if index is not None:
+                index.apply_delta(buffer, mask)
 
         bpy.ops.object.mode_set(mode=saved_mode)
         preferences = \
             context.preferences.addons[__package__].preferences
-        if preferences.auto_palette_refresh:
-            bpy.ops.color_plus.refresh_palette_outliner(color=rgba_value)
+        if preferences.auto_palette_refresh and self.palette_refresh:
+            bpy.ops.color_plus.refresh_palette_outliner()
         return {'FINISHED'}
 
 
@@ -245,22 +292,13 @@ class COLORPLUS_OT_set_color_from_active(DefaultsOperator):
             return {'CANCELLED'}
 
         # Get active vertex color
-        # TODO: Clean up all _layer_type variables
-        # for full vertex & face corner domain support
         layer, layer_type = get_bmesh_active_color(bm, ob.data)
-        components = get_component_colors(bm, layer, layer_type)
-        for component, _color in components.items():
-            if layer_type == "loop" \
-            and component.vert.select \
-            and component.vert == active_selection:
-                if component.vert.select and component.vert == active_selection:
-                    context.scene.color_plus.color_wheel = component[layer]
-                    break
-            # Vert
-            if component.select \
-            and component == active_selection:
-                context.scene.color_plus.color_wheel = component[layer]
-                break
+        if layer_type == "loop":
+            if active_selection.link_loops:
+                context.scene.color_plus.color_wheel = \
+                    active_selection.link_loops[0][layer]
+        elif layer_type == "vert":
+            context.scene.color_plus.color_wheel = active_selection[layer]
 
         bpy.ops.object.mode_set(mode=saved_mode)
         return {'FINISHED'}
@@ -300,148 +338,141 @@ class COLORPLUS_OT_refresh_palette_outliner(DefaultsOperator):
     bl_label = "Refresh Palette"
 
     saved_active_idx: bpy.props.IntProperty(default=-1)
-    color: FloatVectorProperty(
-        subtype='COLOR_GAMMA',
-        default=[1, 1, 1, 1], size=4,
-        options={'HIDDEN'}
-    )
+    full_refresh: bpy.props.BoolProperty(options={'HIDDEN'})
+    relabel_only: bpy.props.BoolProperty(options={'HIDDEN'})
 
-    # TODO Unused sorting method, currently breaks the
-    # outliner in ways I haven't been able to solve
-    #def sort_colors(self, colors: list) -> tuple[list, list]:
-    #    # Convert to HSV, sort list by value
-    #    colors_hsv = []
-    #    for color in colors:
-    #        colors_hsv.append([*colorsys.rgb_to_hsv(*color[:3]), color[3]])
-    #
-    #    # Separate and sort
-    #    hsv_sep = [color for color in colors_hsv if color[0] == 0]
-    #    hsv_values_sorted = sorted(hsv_sep, key=itemgetter(2))
-    #    hsv_hues = [color for color in colors_hsv if color not in hsv_sep]
-    #    hsv_hues_sorted = sorted(hsv_hues, key=itemgetter(0))
-    #    colors_hsv = hsv_values_sorted + hsv_hues_sorted
-    #
-    #    # Convert back to RGB
-    #    colors_rgb = []
-    #    for color in colors_hsv:
-    #        colors_rgb.append(
-    #            [*colorsys.hsv_to_rgb(*color[:3]), color[3]]
-    #        )
-    #    return colors_hsv, colors_rgb
-
-    def get_unique_colors(self, components: dict) -> list:
+    def get_palette_buckets(self, ob: Object, index: PaletteIndex) -> list:
+        """Get the histogram buckets shown on the current
+        palette page of an object, in order."""
         preferences = \
             bpy.context.preferences.addons[__package__].preferences
-        colors = []
-        for color in components.values():
-            if color in colors or color == list(BLANK_ARRAY):
-                continue
-            colors.append(color)
-            if len(colors) > preferences.max_outliner_items:
-                break
-        return colors
-
-    def format_palette_color_name(self, color) -> list:
-        item_color = []
-        if bpy.context.scene.color_plus.rgb_hsv_convert_options == 'rgb':
-            for channel in color[:-1]:
-                item_color.append(round(channel * 255))
-        else: # HSV
-            color_hsv = \
-                colorsys.rgb_to_hsv(color[0], color[1], color[2])
-            for channel in color_hsv:
-                if channel.is_integer():
-                    channel = round(channel)
-                item_color.append(round(channel, 2))
-        if color[3].is_integer():
-            alpha_channel = round(color[3])
-        else:
-            alpha_channel = round(color[3], 3)
-        item_color.append(alpha_channel)
-        return item_color
-
-    def generate_palette(self, ob: Object, colors: list) -> None:
-        for idx, color in enumerate(colors):
+        order = index.palette_order(bpy.context.scene.color_plus.palette_sort)
+
+        # NOTE: Only the current page is stored as outliner
+        # items, the full palette only lives in the index
+        page_size = preferences.max_outliner_items
+        page = min(
+            ob.color_palette_page, get_page_count(len(order), page_size)
+        ) - 1
+        return order[page * page_size:(page + 1) * page_size].tolist()
+
+    def update_palette_labels(self, items) -> None:
+        names = format_color_names(
+            [iterable_to_list(item.saved_color) for item in items]
+        )
+        for item, name in zip(items, names):
+            item.name = name
+
+    def generate_palette(self, ob: Object, index: PaletteIndex,
+                         buckets: list) -> None:
+        histogram = index.histogram
+        names = format_color_names(histogram.colors[buckets])
+        for bucket, name in zip(buckets, names):
+            color = histogram.colors[bucket].tolist()
             item = ob.color_palette.add()
             item.saved_color = color
             item.color = color
-            #item.id = len(ob.color_palette) - 1
-            if idx == self.saved_active_idx:
-                item.id = self.saved_active_idx
-            else:
-                item.id = len(ob.color_palette) - 1
-            item_color = self.format_palette_color_name(color)
-            item.name = "({}, {}, {}, {})".format(
-                item_color[0], item_color[1],
-                item_color[2], item_color[3]
-            )
-
-    def check_existing_color(self, ob: Object) -> bool:
-        """Check if the sent color already exists in the palette outliner.
-
-        Useful for skipping unnecessary outliner refreshes."""
-        rounded_color = []
-        skip_refresh = False
-        for channel in self.color:
-            # NOTE: For whatever reason there is always
-            # massive floating point errors here so we round
-            rounded_color.append(round(channel, 2))
-        palette_colors = \
-            [[*palette.color] for palette in ob.color_palette]
-        for color in palette_colors:
-            for idx, channel in enumerate(color):
-                color[idx] = round(channel, 2)
-            if color == rounded_color:
-                skip_refresh = True
-                break
-        if skip_refresh:
-            return True
-        return False
+            item.count = histogram.counts[bucket]
+            item.name = name
+
+    def sync_palette(self, ob: Object, index: PaletteIndex) -> None:
+        """Sync the palette items with an index.
+
+        Items of emptied colors are removed and new colors are
+        appended, the palette is only regenerated if that doesn't
+        result in the right order."""
+        histogram = index.histogram
+        buckets = self.get_palette_buckets(ob, index)
+        item_buckets = [histogram.find(item.saved_color)
+                        for item in ob.color_palette]
+
+        page_buckets = set(buckets)
+        kept_buckets = \
+            [bucket for bucket in item_buckets if bucket in page_buckets]
+        kept_bucket_set = set(kept_buckets)
+        new_buckets = \
+            [bucket for bucket in buckets if bucket not in kept_bucket_set]
+        if kept_buckets + new_buckets != buckets:
+            ob.color_palette.clear()
+            self.generate_palette(ob, index, buckets)
+        else:
+            for idx in reversed(range(len(item_buckets))):
+                if item_buckets[idx] not in page_buckets:
+                    ob.color_palette.remove(idx)
+            for item, bucket in zip(ob.color_palette, kept_buckets):
+                item.count = histogram.counts[bucket]
+            self.generate_palette(ob, index, new_buckets)
+
+        for idx, item in enumerate(ob.color_palette):
+            item.id = idx
+
+    def use_palette_scan(self, buffer: ColorBuffer) -> bool:
+        """Check if the palette should be built in the background."""
+        preferences = \
+            bpy.context.preferences.addons[__package__].preferences
+        return preferences.async_palette_refresh \
+        and len(buffer) >= preferences.async_palette_threshold
 
     def execute(self, context: Context):
-        saved_mode=context.object.mode
-        bpy.ops.object.mode_set(mode='EDIT')
-
-        duplicate_check = False
-        if [*self.color] != list(BLANK_ARRAY):
-            duplicate_check = True
-
         selected_mesh_objects = \
             [ob for ob in context.selected_objects if ob.type == 'MESH']
         for ob in selected_mesh_objects:
-            # NOTE: Skip palette refresh if the sent color
-            # already exists in the palette outliner
-            if duplicate_check and self.check_existing_color(ob):
+            # NOTE: Display changes only need new item names
+            if self.relabel_only:
+                self.update_palette_labels(ob.color_palette)
                 continue
-            ob.color_palette.clear()
 
             # Preserve the original index color value
-            if len(ob.color_palette):
+            saved_color = None
+            if 0 <= ob.color_palette_active < len(ob.color_palette):
                 palette = ob.color_palette[ob.color_palette_active]
-                saved_color = iterable_to_list(palette.color)
+                saved_color = iterable_to_list(palette.saved_color)
 
-            bm = bmesh.from_edit_mesh(ob.data)
-            layer, layer_type = get_bmesh_active_color(bm, ob.data)
-            components = get_component_colors(bm, layer, layer_type)
-            colors = self.get_unique_colors(components)
-            # TODO Unused sorting method, currently breaks the
-            # outliner in ways I haven't been able to solve
-            #colors = self.sort_colors(colors)
+            buffer = ColorBuffer.from_object(ob)
+            if buffer is None:
+                ob.color_palette.clear()
+                continue
+            # NOTE: Only rescan the mesh if the colors
+            # changed since the palette was last indexed
+            index = None if self.full_refresh else get_palette_index(buffer)
+            if index is None:
+                if self.use_palette_scan(buffer):
+                    COLORPLUS_palette_scans.start(ob, buffer)
+                    continue
+                index = build_palette_index(buffer)
+            COLORPLUS_palette_scans.cancel(ob)
+
+            preferences = \
+                context.preferences.addons[__package__].preferences
+            sync_state = (
+                index.revision,
+                context.scene.color_plus.palette_sort,
+                preferences.max_outliner_items,
+                ob.color_palette_page
+            )
+            if not self.full_refresh and is_palette_synced(ob, sync_state):
+                continue
+            self.sync_palette(ob, index)
+            set_palette_synced(ob, sync_state)
+
+            if 0 <= self.saved_active_idx < len(ob.color_palette):
+                ob.color_palette_active = self.saved_active_idx
+            elif saved_color is not None:
+                for item in ob.color_palette:
+                    if iterable_to_list(item.saved_color) == saved_color:
+                        ob.color_palette_active = item.id
+                        break
+        return {'FINISHED'}
 
-            self.generate_palette(ob, colors)
 
-            if not 'saved_color' in locals():
-                continue
-            for color in ob.color_palette:
-                converted_color = iterable_to_list(color.color)
-                if converted_color == saved_color:
-                    ob.color_palette_active = color.id
-                    del saved_color
-                    break
-                del saved_color
+class COLORPLUS_OT_cancel_palette_scan(DefaultsOperator):
+    """Cancel the background palette refresh of the Active Object"""
+    bl_idname = "color_plus.cancel_palette_scan"
+    bl_label = "Cancel Palette Refresh"
+    bl_options = {'INTERNAL'}
 
-        bpy.ops.object.mode_set(mode=saved_mode)
-        self.color = list(BLANK_ARRAY)
+    def execute(self, context: Context):
+        COLORPLUS_palette_scans.cancel(context.object)
         return {'FINISHED'}
 
 
@@ -454,19 +485,18 @@ class COLORPLUS_OT_change_outliner_color(DefaultsOperator):
     def execute(self, context: Context):
         ob = context.object
         saved_mode = ob.mode
-        bpy.ops.object.mode_set(mode='EDIT')
+        bpy.ops.object.mode_set(mode='OBJECT')
 
         palette = ob.color_palette[self.saved_active_idx]
-        palette_saved_color = iterable_to_list(palette.saved_color)
 
-        bm = bmesh.from_edit_mesh(ob.data)
-        layer, layer_type = get_bmesh_active_color(bm, ob.data)
-        components = get_component_colors(bm, layer, layer_type)
-        for component, color in components.items():
-            if color != palette_saved_color:
-                continue
-            component[layer] = palette.color
-        bmesh.update_edit_mesh(ob.data)
+        buffer = ColorBuffer.from_mesh(ob.data)
+        if buffer is not None:
+            index = get_palette_index(buffer)
+            elements = lookup_color(buffer, palette.saved_color)
+            buffer.colors[elements] = palette.color
+            buffer.write()
+            if index is not None:
+                index.apply_delta(buffer, elements)
 
         palette.name = \
             f'({round(palette.color[0] * 255)}, ' \
@@ -478,6 +508,84 @@ class COLORPLUS_OT_change_outliner_color(DefaultsOperator):
         return {'FINISHED'}
 
 
+class COLORPLUS_OT_remap_palette(DefaultsOperator):
+    """Replace colors using a source to target color table"""
+    bl_idname = "color_plus.remap_palette"
+    bl_label = "Remap Palette"
+
+    source: bpy.props.EnumProperty(
+        items=(
+            ('outliner', "Outliner", "Apply the staged color edits of the Palette Outliner"),
+            ('file', "File", "Read the color table from a CSV or JSON file")
+        ),
+        name='Source'
+    )
+    use_selected: bpy.props.BoolProperty(
+        name='All Selected Objects',
+        description='Remap the colors of every selected object instead of only the Active Object',
+        default=True
+    )
+    filepath: bpy.props.StringProperty(subtype='FILE_PATH')
+    filter_glob: bpy.props.StringProperty(
+        default="*.csv;*.json", options={'HIDDEN'}
+    )
+
+    @classmethod
+    def poll(cls, context: Context):
+        return context.object is not None and context.object.type == 'MESH'
+
+    def invoke(self, context: Context, _event):
+        if self.source == 'file':
+            context.window_manager.fileselect_add(self)
+            return {'RUNNING_MODAL'}
+        return self.execute(context)
+
+    def get_staged_edits(self, ob: Object) -> tuple[list, list]:
+        sources = []
+        targets = []
+        for item in ob.color_palette:
+            if iterable_to_list(item.color) != iterable_to_list(item.saved_color):
+                sources.append(iterable_to_list(item.saved_color))
+                targets.append(iterable_to_list(item.color))
+        return sources, targets
+
+    def execute(self, context: Context):
+        if self.source == 'file':
+            try:
+                sources, targets = read_remap_table(bpy.path.abspath(self.filepath))
+            except (OSError, ValueError, KeyError, TypeError) as error:
+                self.report({'ERROR'}, f"Could not read the remap table: {error}")
+                return {'CANCELLED'}
+        else: # Outliner
+            sources, targets = self.get_staged_edits(context.object)
+            if not sources:
+                self.report({'INFO'}, "No staged color edits to apply")
+                return {'CANCELLED'}
+
+        saved_mode = context.object.mode
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        if self.use_selected:
+            mesh_objects = \
+                [ob for ob in context.selected_objects if ob.type == 'MESH']
+        else:
+            mesh_objects = [context.object]
+        remapped_count = 0
+        for ob in mesh_objects:
+            buffer = ColorBuffer.from_mesh(ob.data)
+            if buffer is None:
+                continue
+            elements = remap_colors(buffer, sources, targets)
+            if len(elements):
+                buffer.write()
+                remapped_count += len(elements)
+
+        bpy.ops.object.mode_set(mode=saved_mode)
+        bpy.ops.color_plus.refresh_palette_outliner()
+        self.report({'INFO'}, f"Remapped {remapped_count} elements")
+        return {'FINISHED'}
+
+
 class COLORPLUS_OT_get_active_outliner_color(DefaultsOperator):
     """Apply the Outliner Color to the Active Color"""
     bl_idname = "color_plus.get_active_outliner_color"
@@ -511,10 +619,64 @@ class COLORPLUS_OT_apply_outliner_color(DefaultsOperator):
 
 
 class COLORPLUS_OT_select_outliner_color(DefaultsOperator):
-    """Select vertices based on the Outliner Color (WARNING: This does not remove your existing selection)"""
+    """Select vertices with a color close to the Outliner Color"""
     bl_idname = "color_plus.select_outliner_color"
     bl_label = "Select Geometry from Outliner Color"
 
+    select_mode: bpy.props.EnumProperty(
+        items=(
+            ('replace', "Replace", "Replace the existing selection"),
+            ('extend', "Extend", "Add to the existing selection"),
+            ('subtract', "Subtract", "Remove from the existing selection")
+        ),
+        name='Mode',
+        default='extend'
+    )
+    distance_type: bpy.props.EnumProperty(
+        items=(
+            ('rgb', "RGB", "Distance between RGBA values"),
+            ('hsv', "HSV", "Distance between HSVA values"),
+            ('delta_e', "ΔE", "Perceptual distance between colors (CIE76 ΔE / 100)")
+        ),
+        name='Distance'
+    )
+    threshold: bpy.props.FloatProperty(
+        name='Threshold',
+        description='The maximum distance between a color and the Outliner Color',
+        default=0.0,
+        min=0.0,
+        soft_max=1.0,
+        step=1,
+        precision=3
+    )
+
+    def get_color_mask(self, buffer: ColorBuffer, color) -> np.ndarray:
+        """Mask of elements within the threshold of a color.
+
+        Distances are computed once per palette color if
+        the palette index is up to date."""
+        index = get_palette_index(buffer)
+        if index is None:
+            colors = buffer.colors
+        else:
+            colors = index.histogram.colors
+
+        space = self.distance_type
+        if space == 'delta_e':
+            space = 'lab'
+            # NOTE: ΔE is computed from linear colors
+            if buffer.color_prop == "color_srgb":
+                colors = srgb_to_linear(colors)
+                color = srgb_to_linear(color[:4])
+        distance = color_distance(colors, color, space)
+        if space == 'lab':
+            distance /= 100.0
+
+        mask = distance <= self.threshold
+        if index is not None:
+            return mask[index.histogram.inverse]
+        return mask
+
     def execute(self, context: Context):
         ob = context.object
         saved_mode = ob.mode
@@ -523,21 +685,21 @@ class COLORPLUS_OT_select_outliner_color(DefaultsOperator):
         context.tool_settings.mesh_select_mode = (True, False, False)
 
         palette = ob.color_palette[ob.color_palette_active]
-        active_color = iterable_to_list(palette.color)
 
-        # Object mode BMesh correct mesh update
-        bm = bmesh.new()
-        bm.from_mesh(ob.data)
-        layer, layer_type = get_bmesh_active_color(bm, ob.data)
-        components = get_component_colors(bm, layer, layer_type)
-        for component, color in components.items():
-            if color != active_color:
-                continue
-            if layer_type == 'loop':
-                component.vert.select_set(True)
-            else: # Vert
-                component.select_set(True)
-        bm.to_mesh(ob.data)
+        buffer = ColorBuffer.from_mesh(ob.data)
+        if buffer is not None:
+            if self.select_mode == 'replace':
+                vert_select = np.zeros(len(ob.data.vertices), dtype=bool)
+            else:
+                vert_select = buffer.vert_select.copy()
+            # NOTE: Staged edits live in `color`, the
+            # geometry still uses the saved color
+            mask = self.get_color_mask(
+                buffer, iterable_to_list(palette.saved_color)
+            )
+            vert_select[buffer.vertices(mask)] = \
+                self.select_mode != 'subtract'
+            set_vertex_selection(ob.data, vert_select)
 
         bpy.ops.object.mode_set(mode=saved_mode)
         return {'FINISHED'}
@@ -551,18 +713,18 @@ class COLORPLUS_OT_delete_outliner_color(DefaultsOperator):
     def execute(self, context: Context):
         ob = context.object
         saved_mode = ob.mode
-        bpy.ops.object.mode_set(mode='EDIT')
+        bpy.ops.object.mode_set(mode='OBJECT')
 
         palette = ob.color_palette[ob.color_palette_active]
-        palette_color = iterable_to_list(palette.color)
 
-        bm = bmesh.from_edit_mesh(ob.data)
-        layer, layer_type = get_bmesh_active_color(bm, ob.data)
-        component_colors = get_component_colors(bm, layer, layer_type)
-        for component, color in component_colors.items():
-            if color == palette_color:
-                component[layer] = BLANK_ARRAY
-        bmesh.update_edit_mesh(ob.data)
+        buffer = ColorBuffer.from_mesh(ob.data)
+        if buffer is not None:
+            index = get_palette_index(buffer)
+            elements = lookup_color(buffer, palette.saved_color)
+            buffer.colors[elements] = BLANK_ARRAY
+            buffer.write()
+            if index is not None:
+                index.apply_delta(buffer, elements)
 
         bpy.ops.object.mode_set(mode=saved_mode)
 
@@ -584,29 +746,240 @@ class COLORPLUS_OT_convert_to_vertex_group(DefaultsOperator):
         bpy.ops.object.mode_set(mode='OBJECT')
 
         palette = ob.color_palette[ob.color_palette_active]
-        palette_color = iterable_to_list(palette.color)
 
-        # Object mode BMesh for vgroup add (only works in ob mode)
-        bm = bmesh.new()
-        bm.from_mesh(ob.data)
-        layer, layer_type = get_bmesh_active_color(bm, ob.data)
-        components = get_component_colors(bm, layer, layer_type)
+        # NOTE: Vertex group add only works in object mode
+        buffer = ColorBuffer.from_mesh(ob.data)
+        if buffer is not None:
+            vert_indices = \
+                buffer.vertices(lookup_color(buffer, palette.saved_color))
+            converted_vgroup = ob.vertex_groups.new(name=palette.name)
+            converted_vgroup.add(vert_indices.tolist(), 1.0, 'ADD')
 
-        # Get vertices with the corresponding color value
-        vert_indices = []
-        for component, color in components.items():
-            if layer_type == 'loop':
-                index = component.vert.index
-            else: # Vert
-                index = component.index
-            if index in vert_indices or color != palette_color:
+        bpy.ops.object.mode_set(mode=saved_mode)
+        return {'FINISHED'}
+
+
+class COLORPLUS_OT_convert_palette_to_vertex_groups(DefaultsOperator):
+    """Convert every palette color of the selected objects to a Vertex Group"""
+    bl_idname = "color_plus.convert_palette_to_vertex_groups"
+    bl_label = "Convert Palette to Vertex Groups"
+
+    def execute(self, context: Context):
+        saved_mode = context.object.mode
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        selected_mesh_objects = \
+            [ob for ob in context.selected_objects if ob.type == 'MESH']
+        for ob in selected_mesh_objects:
+            buffer = ColorBuffer.from_mesh(ob.data)
+            if buffer is None:
+                continue
+            index = get_palette_index(buffer)
+            if index is None:
+                index = build_palette_index(buffer)
+
+            # NOTE: Vertex groups are created in palette order
+            # and blank colors are skipped, same as the outliner
+            buckets = index.palette_order(context.scene.color_plus.palette_sort)
+            offsets, vert_indices = index.bucket_vertices(buffer)
+            names = format_color_names(index.histogram.colors[buckets])
+            existing_names = {vgroup.name for vgroup in ob.vertex_groups}
+            used_names = set()
+            for bucket, name in zip(buckets.tolist(), names):
+                # NOTE: Names are rounded, so close colors can share
+                # one. Number them instead of replacing each other
+                group_name = name
+                suffix = 1
+                while group_name in used_names:
+                    group_name = f"{name}.{suffix:03}"
+                    suffix += 1
+                used_names.add(group_name)
+
+                # NOTE: Recreate groups from earlier runs so vertices
+                # that no longer use the color aren't left behind
+                if group_name in existing_names:
+                    ob.vertex_groups.remove(ob.vertex_groups[group_name])
+                vgroup = ob.vertex_groups.new(name=group_name)
+                vgroup.add(
+                    vert_indices[offsets[bucket]:offsets[bucket + 1]].tolist(),
+                    1.0, 'REPLACE'
+                )
+
+        bpy.ops.object.mode_set(mode=saved_mode)
+        return {'FINISHED'}
+
+
+class COLORPLUS_OT_convert_channels_to_vertex_groups(DefaultsOperator):
+    """Convert the R G B A channels of the Active Color to Vertex Group weights"""
+    bl_idname = "color_plus.convert_channels_to_vertex_groups"
+    bl_label = "Convert Channels to Vertex Groups"
+
+    channels: bpy.props.EnumProperty(
+        items=(
+            ('R', "R", "Red"),
+            ('G', "G", "Green"),
+            ('B', "B", "Blue"),
+            ('A', "A", "Alpha")
+        ),
+        name='Channels',
+        options={'ENUM_FLAG'},
+        default={'R', 'G', 'B', 'A'}
+    )
+
+    def execute(self, context: Context):
+        saved_mode = context.object.mode
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        selected_mesh_objects = \
+            [ob for ob in context.selected_objects if ob.type == 'MESH']
+        for ob in selected_mesh_objects:
+            buffer = ColorBuffer.from_mesh(ob.data)
+            if buffer is None:
                 continue
-            vert_indices.append(index)
+            vertex_colors = buffer.vertex_colors()
+            for channel, channel_name in enumerate('RGBA'):
+                if channel_name not in self.channels:
+                    continue
+                # NOTE: Recreate existing groups so
+                # no stale weights are left behind
+                name = f"{buffer.name}_{channel_name}"
+                vgroup = ob.vertex_groups.get(name)
+                if vgroup is not None:
+                    ob.vertex_groups.remove(vgroup)
+                vgroup = ob.vertex_groups.new(name=name)
+                set_vertex_group_weights(vgroup, vertex_colors[:, channel])
+
+        bpy.ops.object.mode_set(mode=saved_mode)
+        return {'FINISHED'}
 
-        converted_vgroup = ob.vertex_groups.new(name=palette.name)
-        converted_vgroup.add(vert_indices, 1.0, 'ADD')
+
+class COLORPLUS_OT_vertex_group_to_color(DefaultsOperator):
+    """Convert Vertex Group weights to vertex color"""
+    bl_idname = "color_plus.vertex_group_to_color"
+    bl_label = "Vertex Group to Color"
+
+    mapping: bpy.props.EnumProperty(
+        items=(
+            ('grayscale', "Grayscale", "Use the weights as gray values"),
+            ('ramp', "RGB Ramp", "Blue to red ramp, same as Weight Paint mode"),
+            ('channel', "Channel", "Write the weights to one channel, keeping the others"),
+            ('pack', "Channel Pack", "Write a Vertex Group to each channel")
+        ),
+        name='Mapping'
+    )
+    vertex_group: bpy.props.StringProperty(name='Vertex Group')
+    channel: bpy.props.EnumProperty(
+        items=(
+            ('0', "R", "Red"),
+            ('1', "G", "Green"),
+            ('2', "B", "Blue"),
+            ('3', "A", "Alpha")
+        ),
+        name='Channel'
+    )
+    red_group: bpy.props.StringProperty(name='R')
+    green_group: bpy.props.StringProperty(name='G')
+    blue_group: bpy.props.StringProperty(name='B')
+    alpha_group: bpy.props.StringProperty(name='A')
+    target: bpy.props.EnumProperty(
+        items=(
+            ('active', "Active Color", "Write to the Active Color, creating one if needed"),
+            ('new', "New Color", "Write to a new color attribute")
+        ),
+        name='Target'
+    )
+    attribute_name: bpy.props.StringProperty(name='Name', default="Weights")
+    domain: bpy.props.EnumProperty(
+        items=(
+            ('CORNER', "Face Corner", ""),
+            ('POINT', "Vertex", "")
+        ),
+        name='Domain'
+    )
+
+    @classmethod
+    def poll(cls, context: Context):
+        return context.object is not None \
+        and context.object.type == 'MESH' \
+        and len(context.object.vertex_groups)
+
+    def get_group_names(self) -> list[str]:
+        if self.mapping == 'pack':
+            return [self.red_group, self.green_group,
+                    self.blue_group, self.alpha_group]
+        return [self.vertex_group]
+
+    def get_buffer(self, ob: Object) -> ColorBuffer:
+        if self.target == 'new':
+            attribute = create_color(
+                ob.data, self.attribute_name, self.domain, 'FLOAT_COLOR'
+            )
+            return ColorBuffer(ob.data, attribute)
+        return ColorBuffer.from_mesh(ob.data, create=True)
+
+    def invoke(self, context: Context, _event):
+        vertex_groups = context.object.vertex_groups
+        if vertex_groups.active is not None:
+            self.vertex_group = self.red_group = vertex_groups.active.name
+        return self.execute(context)
+
+    def draw(self, context: Context):
+        layout = self.layout
+        layout.use_property_split = True
+
+        ob = context.object
+        layout.prop(self, 'mapping')
+        if self.mapping == 'pack':
+            for prop in ('red_group', 'green_group', 'blue_group', 'alpha_group'):
+                layout.prop_search(self, prop, ob, 'vertex_groups')
+        else:
+            layout.prop_search(self, 'vertex_group', ob, 'vertex_groups')
+        if self.mapping == 'channel':
+            layout.row().prop(self, 'channel', expand=True)
+
+        layout.prop(self, 'target')
+        if self.target == 'new':
+            layout.prop(self, 'attribute_name')
+            layout.prop(self, 'domain')
+
+    def execute(self, context: Context):
+        saved_mode = context.object.mode
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        names = self.get_group_names()
+        selected_mesh_objects = \
+            [ob for ob in context.selected_objects if ob.type == 'MESH']
+        for ob in selected_mesh_objects:
+            group_names = \
+                [name for name in names if name in ob.vertex_groups]
+            if not group_names:
+                continue
+            weights = get_vertex_group_weights(context, ob, group_names)
+
+            buffer = self.get_buffer(ob)
+            element_weights = weights[buffer.element_vert]
+            if self.mapping == 'grayscale':
+                buffer.colors[:, :3] = element_weights
+            elif self.mapping == 'ramp':
+                # NOTE: Hue goes from blue (2/3) at 0 to red at 1
+                ramp = np.ones((len(buffer), 3))
+                ramp[:, 0] = (1.0 - element_weights[:, 0]) * (2.0 / 3.0)
+                buffer.colors[:, :3] = hsv_to_rgb(ramp)
+            elif self.mapping == 'channel':
+                buffer.colors[:, int(self.channel)] = element_weights[:, 0]
+            else: # Pack
+                for channel, name in enumerate(names):
+                    if name in group_names:
+                        buffer.colors[:, channel] = \
+                            element_weights[:, group_names.index(name)]
+            buffer.write()
 
         bpy.ops.object.mode_set(mode=saved_mode)
+
+        preferences = \
+            context.preferences.addons[__package__].preferences
+        if preferences.auto_palette_refresh:
+            bpy.ops.color_plus.refresh_palette_outliner()
         return {'FINISHED'}
 
 
@@ -644,9 +1017,17 @@ class COLORPLUS_OT_apply_color_to_border(DefaultsOperator):
     border_type: bpy.props.EnumProperty(
         items=(
             ('inner', "Inner", ""),
-            ('outer', "Outer", "")
+            ('outer', "Outer", ""),
+            ('both', "Both", "")
         )
     )
+    rings: bpy.props.IntProperty(
+        name='Width',
+        description='The amount of face rings the border extends into',
+        default=1,
+        min=1,
+        soft_max=16
+    )
 
     @classmethod
     def poll(cls, context: Context):
@@ -662,55 +1043,37 @@ class COLORPLUS_OT_apply_color_to_border(DefaultsOperator):
         selected_mesh_objects = \
             [ob for ob in context.selected_objects if ob.type == 'MESH']
         for ob in selected_mesh_objects:
-            if get_active_color(ob.data) is None:
-                create_color(ob.data)
-
-            bm = bmesh.new()
-            bm.from_mesh(ob.data)
-            layer, _layer_type = get_bmesh_active_color(bm, ob.data)
-
-            # Get border vertices & linked faces
-            border_vertices = set([])
-            linked_faces = []
-            for edge in [edge for edge in bm.edges if edge.select]:
-                if edge.is_boundary \
-                or edge.link_faces[0].select != edge.link_faces[1].select:
-                    for vert in edge.verts:
-                        if vert.index not in border_vertices:
-                            border_vertices.add(vert.index)
-                    linked_faces.extend(list(edge.link_faces))
-
-            # Search linked faces for loops on
-            # the correct sides of the vertices
-            if self.border_type == 'inner':
-                for face in linked_faces:
-                    if not face.select:
-                        continue
-                    for loop in face.loops:
-                        if loop.vert.index in border_vertices:
-                            loop[layer] = color_plus.color_wheel
-            else: # NOTE: Outer
-                for face in linked_faces:
-                    if face.select:
-                        continue
-                    for loop in face.loops:
-                        if loop.vert.index in border_vertices:
-                            loop[layer] = color_plus.color_wheel
-            bm.to_mesh(ob.data)
+            buffer = ColorBuffer.from_mesh(ob.data, create=True)
+            edge_select = np.empty(len(ob.data.edges), dtype=bool)
+            ob.data.edges.foreach_get("select", edge_select)
+            border_loops = get_border_loops(
+                buffer.topology, buffer.face_select, edge_select,
+                self.border_type, self.rings
+            )
+            if not border_loops.any():
+                continue
+
+            index = get_palette_index(buffer)
+            if buffer.is_corner:
+                elements = border_loops
+            else: # Vert
+                elements = np.unique(buffer.loop_vert[border_loops])
+            buffer.colors[elements] = color_plus.color_wheel
+            buffer.write()
+            if index is not None:
+                index.apply_delta(buffer, elements)
 
         bpy.ops.object.mode_set(mode=saved_mode)
 
         preferences = \
             context.preferences.addons[__package__].preferences
         if preferences.auto_palette_refresh:
-            bpy.ops.color_plus.refresh_palette_outliner(
-                color=color_plus.color_wheel
-            )
+            bpy.ops.color_plus.refresh_palette_outliner()
         return {'FINISHED'}
 
 
 class COLORPLUS_OT_dirty_vertex_color(DefaultsOperator):
-    """Generate dirty vertex color"""
+    """Generate dirty vertex color on all selected objects"""
     bl_idname = "color_plus.dirty_vertex_color"
     bl_label = "Generate VColor"
     bl_options = {'INTERNAL', 'REGISTER', 'UNDO'}
@@ -724,28 +1087,114 @@ class COLORPLUS_OT_dirty_vertex_color(DefaultsOperator):
     selection_only: bpy.props.BoolProperty(default=False, name='Use Selection')
 
     def execute(self, context: Context):
-        if not bpy.ops.paint.vertex_paint_toggle.poll():
-            self.report({'ERROR'}, "Could not switch to Vertex Paint mode")
-            return {'CANCELLED'}
+        saved_mode=context.object.mode
+
+        bpy.ops.object.mode_set(mode='OBJECT')
 
-        saved_mode=context.mode
+        selected_mesh_objects = \
+            [ob for ob in context.selected_objects if ob.type == 'MESH']
+        for ob in selected_mesh_objects:
+            buffer = ColorBuffer.from_mesh(ob.data, create=True)
+            tones = get_vertex_dirt(
+                ob.data, buffer.topology,
+                blur_strength=self.blur_strength,
+                blur_iterations=self.blur_iterations,
+                clean_angle=self.clean_angle,
+                dirt_angle=self.dirt_angle,
+                dirt_only=self.dirt_only,
+                normalize=self.normalize
+            )
 
-        context.object.data.use_paint_mask = self.selection_only
+            if self.selection_only:
+                loop_select = buffer.face_select[buffer.loop_face]
+                if buffer.is_corner:
+                    elements = np.flatnonzero(loop_select)
+                else: # Vert
+                    elements = np.unique(buffer.loop_vert[loop_select])
+            else:
+                elements = np.arange(len(buffer))
+
+            # NOTE: Tones darken linear colors like the paint operator
+            colors = buffer.colors[elements]
+            if buffer.color_prop == "color_srgb":
+                colors = srgb_to_linear(colors)
+            colors[:, :3] *= tones[buffer.element_vert[elements], None]
+            if buffer.color_prop == "color_srgb":
+                colors = linear_to_srgb(colors)
+            buffer.colors[elements] = colors
+            buffer.write()
 
-        if context.mode != 'PAINT_VERTEX':
-            bpy.ops.paint.vertex_paint_toggle()
+        bpy.ops.object.mode_set(mode=saved_mode)
+
+        preferences = \
+            context.preferences.addons[__package__].preferences
+        if preferences.auto_palette_refresh:
+            bpy.ops.color_plus.refresh_palette_outliner()
+        return {'FINISHED'}
 
-        bpy.ops.paint.vertex_color_dirt(
-            blur_strength=self.blur_strength,
-            blur_iterations=self.blur_iterations,
-            clean_angle=self.clean_angle,
-            dirt_angle=self.dirt_angle,
-            dirt_only=self.dirt_only,
-            normalize=self.normalize
+
+class COLORPLUS_OT_bake_ambient_occlusion(DefaultsOperator):
+    """Bake ambient occlusion of the selected objects to their Active Color"""
+    bl_idname = "color_plus.bake_ambient_occlusion"
+    bl_label = "Bake Ambient Occlusion"
+    # NOTE: The colors are written after the operator returns,
+    # the bake pushes its own undo step when it's done
+    bl_options = {'REGISTER'}
+
+    def execute(self, context: Context):
+        color_plus = context.scene.color_plus
+        saved_mode=context.object.mode
+
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        selected_mesh_objects = \
+            [ob for ob in context.selected_objects if ob.type == 'MESH']
+        if not selected_mesh_objects:
+            bpy.ops.object.mode_set(mode=saved_mode)
+            return {'CANCELLED'}
+        occluders = []
+        if color_plus.ao_scene_occluders:
+            occluders = [
+                ob for ob in context.visible_objects
+                if ob.type == 'MESH' and ob not in selected_mesh_objects
+            ]
+        tree = build_occluder_tree(
+            selected_mesh_objects, context.evaluated_depsgraph_get(), occluders
         )
 
-        if saved_mode != 'PAINT_VERTEX':
-            bpy.ops.object.editmode_toggle()
+        bakes = []
+        for ob in selected_mesh_objects:
+            buffer = ColorBuffer.from_mesh(ob.data, create=True)
+            bakes.append(AOBake(
+                ob, buffer, tree, color_plus.ao_samples, color_plus.ao_distance
+            ))
+
+        # NOTE: Timers don't run without a window, so
+        # in background mode wait for the bake instead
+        if bpy.app.background:
+            window_manager = context.window_manager
+            window_manager.progress_begin(0, len(bakes))
+            for idx, bake in enumerate(bakes):
+                bake.wait()
+                bake.finish()
+                window_manager.progress_update(idx + 1)
+            window_manager.progress_end()
+        else:
+            for bake in bakes:
+                COLORPLUS_ao_bakes.start(bake)
+
+        bpy.ops.object.mode_set(mode=saved_mode)
+        return {'FINISHED'}
+
+
+class COLORPLUS_OT_cancel_ao_bake(DefaultsOperator):
+    """Cancel the ambient occlusion bake of the Active Object"""
+    bl_idname = "color_plus.cancel_ao_bake"
+    bl_label = "Cancel AO Bake"
+    bl_options = {'INTERNAL'}
+
+    def execute(self, context: Context):
+        COLORPLUS_ao_bakes.cancel(context.object)
         return {'FINISHED'}
 
 
@@ -754,79 +1203,96 @@ class COLORPLUS_OT_generate_color(DefaultsOperator):
     bl_idname = "color_plus.generate_color"
     bl_label = "Generate Vertex Color"
 
-    bm = None
-    layer = None
-    uv_islands = None
+    seed: bpy.props.IntProperty(
+        name='Seed',
+        description='Seed for the random colors, mixed with each object name',
+        default=0,
+        min=0
+    )
+
+    rng = None
+
+    def get_rng(self, ob: Object) -> np.random.Generator:
+        # NOTE: Python's `hash()` is salted per process,
+        # crc32 gives the same object seed on every run
+        return np.random.default_rng(
+            (self.seed, zlib.crc32(ob.name.encode()))
+        )
+
+    def random_colors(self, count: int) -> np.ndarray:
+        colors = np.ones((count, 4))
+        colors[:, :3] = self.rng.random((count, 3))
+        return colors
+
+    def set_loop_colors(self, buffer: ColorBuffer, loop_colors: np.ndarray,
+                        loops=slice(None)) -> None:
+        if buffer.is_corner:
+            buffer.colors[loops] = loop_colors
+        else: # Vert
+            buffer.colors[buffer.loop_vert[loops]] = loop_colors
 
-    def uv_shell(self):
-        for island_idxs in self.uv_islands:
-            random_color = [random(), random(), random(), 1]
-            for face_idx in island_idxs:
-                face = self.bm.faces[face_idx]
-                for loop in face.loops:
-                    loop[self.layer] = random_color
+    def uv_shell(self, buffer: ColorBuffer, island_labels: np.ndarray):
+        if not len(island_labels):
+            return
+        island_colors = self.random_colors(island_labels.max() + 1)
+        self.set_loop_colors(
+            buffer, island_colors[island_labels[buffer.loop_face]]
+        )
 
-    def uv_border(self):
+    def uv_border(self, buffer: ColorBuffer, island_labels: np.ndarray):
+        if not len(island_labels):
+            return
         color_plus = bpy.context.scene.color_plus
-        for island_idxs in self.uv_islands:
-            if color_plus.generate_per_uv_border == 'random_col':
-                random_color = [random(), random(), random(), 1]
-
-            # Get border vertices & linked faces
-            border_vertices = set([])
-            linked_faces = set([])
-            for edge in self.bm.edges:
-                if edge.is_boundary \
-                or (edge.link_faces[0].index in island_idxs \
-                and edge.link_faces[1].index not in island_idxs) \
-                or (edge.link_faces[0].index not in island_idxs \
-                and edge.link_faces[1].index in island_idxs):
-                    for vert in edge.verts:
-                        if vert.index in border_vertices:
-                            continue
-                        border_vertices.add(vert.index)
-                for vert in edge.verts:
-                    if vert.index not in border_vertices:
-                        continue
-                    for face in edge.link_faces:
-                        if face in linked_faces:
-                            continue
-                        linked_faces.add(face)
-
-            # Assign a color to interior loops of linked faces
-            for face in linked_faces:
-                if face.index not in island_idxs:
-                    continue
-                for loop in face.loops:
-                    if loop.vert.index not in border_vertices:
-                        continue
-                    if color_plus.generate_per_uv_border == 'random_col':
-                        loop[self.layer] = random_color
-                    else: # Apply active color
-                        loop[self.layer] = color_plus.color_wheel
-
-    def face(self):
-        for face in self.bm.faces:
-            random_color = [random(), random(), random(), 1]
-            for loop in face.loops:
-                loop[self.layer] = random_color
-
-    def vertex(self):
-        for face in self.bm.faces:
-            random_color = [random(), random(), random(), 1]
-            for loop in face.loops:
-                loop[self.layer] = random_color
-
-                for vert in self.bm.verts:
-                    random_color = [random(), random(), random(), 1]
-                    for loop in vert.link_loops:
-                        loop[self.layer] = random_color
-
-    def point(self):
-        for face in self.bm.faces:
-            for loop in face.loops:
-                random_color = [random(), random(), random(), 1]
-                loop[self.layer] = random_color
+        island_count = island_labels.max() + 1
+        if color_plus.generate_per_uv_border == 'random_col':
+            island_colors = self.random_colors(island_count)
+        else: # Apply active color
+            island_colors = \
+                np.tile(np.array(color_plus.color_wheel), (island_count, 1))
+
+        border_loops = \
+            get_label_border_loops(buffer.topology, island_labels)
+        self.set_loop_colors(
+            buffer,
+            island_colors[island_labels[buffer.loop_face[border_loops]]],
+            border_loops
+        )
+
+    def face(self, buffer: ColorBuffer):
+        face_colors = self.random_colors(buffer.topology.face_count)
+        self.set_loop_colors(buffer, face_colors[buffer.loop_face])
+
+    def vertex(self, buffer: ColorBuffer):
+        vert_colors = self.random_colors(buffer.topology.vert_count)
+        if buffer.is_corner:
+            buffer.colors[:] = vert_colors[buffer.loop_vert]
+        else: # Vert
+            buffer.colors[:] = vert_colors
+
+    def point(self, buffer: ColorBuffer):
+        # NOTE: A point domain attribute can't hold a color
+        # per corner, so this is the same as per vertex
+        buffer.colors[:] = self.random_colors(len(buffer))
+
+    def mesh_island(self, buffer: ColorBuffer):
+        color_plus = bpy.context.scene.color_plus
+        cut_edges = None
+        if color_plus.generate_island_cuts:
+            cut_edges = np.zeros(buffer.topology.edge_count, dtype=bool)
+            edge_flags = np.empty_like(cut_edges)
+            for cut, flag_name in (('SHARP', "use_edge_sharp"),
+                                   ('SEAM', "use_seam")):
+                if cut in color_plus.generate_island_cuts:
+                    buffer.data.edges.foreach_get(flag_name, edge_flags)
+                    cut_edges |= edge_flags
+
+        island_labels = get_mesh_island_labels(buffer.topology, cut_edges)
+        if not len(island_labels):
+            return
+        island_colors = self.random_colors(island_labels.max() + 1)
+        self.set_loop_colors(
+            buffer, island_colors[island_labels[buffer.loop_face]]
+        )
 
     def execute(self, context: Context):
         color_plus = context.scene.color_plus
@@ -839,32 +1305,28 @@ class COLORPLUS_OT_generate_color(DefaultsOperator):
         selected_mesh_objects = \
             [ob for ob in context.selected_objects if ob.type == 'MESH']
         for ob in selected_mesh_objects:
+            self.rng = self.get_rng(ob)
+            island_labels = None
             if color_plus.generate in ('per_uv_shell', 'per_uv_border'):
-                try:
-                    self.uv_islands = \
-                        bpy_extras.mesh_utils.mesh_linked_uv_islands(ob.data)
-                except AttributeError:
+                island_labels = get_uv_island_labels(ob.data)
+                if island_labels is None:
                     no_uv_obs.append(ob.name)
                     continue
 
-            if get_active_color(ob.data) is None:
-                create_color(ob.data)
-
-            self.bm = bmesh.new()
-            self.bm.from_mesh(ob.data)
-            self.bm.faces.ensure_lookup_table()
-            self.layer, _layer_type = get_bmesh_active_color(self.bm, ob.data)
+            buffer = ColorBuffer.from_mesh(ob.data, create=True)
             if color_plus.generate == 'per_uv_shell':
-                self.uv_shell()
+                self.uv_shell(buffer, island_labels)
             elif color_plus.generate == 'per_uv_border':
-                self.uv_border()
+                self.uv_border(buffer, island_labels)
             elif color_plus.generate == 'per_face':
-                self.face()
+                self.face(buffer)
             elif color_plus.generate == 'per_vertex':
-                self.vertex()
+                self.vertex(buffer)
             elif color_plus.generate == 'per_point':
-                self.point()
-            self.bm.to_mesh(ob.data)
+                self.point(buffer)
+            elif color_plus.generate == 'per_mesh_island':
+                self.mesh_island(buffer)
+            buffer.write()
 
         if color_plus.generate in ('per_uv_shell', 'per_uv_border') \
         and no_uv_obs:
@@ -894,15 +1356,22 @@ classes = (
     COLORPLUS_OT_apply_attribute_shading,
     COLORPLUS_OT_remove_all_vertex_color,
     COLORPLUS_OT_refresh_palette_outliner,
+    COLORPLUS_OT_cancel_palette_scan,
     COLORPLUS_OT_change_outliner_color,
+    COLORPLUS_OT_remap_palette,
     COLORPLUS_OT_get_active_outliner_color,
     COLORPLUS_OT_apply_outliner_color,
     COLORPLUS_OT_select_outliner_color,
     COLORPLUS_OT_delete_outliner_color,
     COLORPLUS_OT_convert_to_vertex_group,
+    COLORPLUS_OT_convert_palette_to_vertex_groups,
+    COLORPLUS_OT_convert_channels_to_vertex_groups,
+    COLORPLUS_OT_vertex_group_to_color,
     COLORPLUS_OT_custom_color_apply,
     COLORPLUS_OT_apply_color_to_border,
     COLORPLUS_OT_dirty_vertex_color,
+    COLORPLUS_OT_bake_ambient_occlusion,
+    COLORPLUS_OT_cancel_ao_bake,
     COLORPLUS_OT_generate_color
 )
 
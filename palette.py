@@ -0,0 +1,670 @@
+import csv
+import json
+import zlib
+import itertools
+
+import numpy as np
+
+import bpy
+from bpy.app.handlers import persistent
+
+from bpy.types import Object, Mesh
+
+from .color_buffer import ColorBuffer
+from .topology import group_indices
+from .colorspace import rgb_to_hsv
+from .functions import get_view3d_override, tag_view3d_redraw
+from .constants import BLANK_ARRAY, PALETTE_SCAN_CHUNK_SIZE
+
+
+# NOTE: Exact float keys are the 4 float32 channels as two big endian
+# 64 bit halves, so comparing their bytes compares the halves in order
+FLOAT_KEY_TYPE = np.dtype((np.void, 16))
+
+
+def pack_colors(colors: np.ndarray, bits: int=32) -> np.ndarray:
+    """Pack `(N, 4)` colors into one key per color.
+
+    8 bits per channel packs into uint32 and is lossless for byte
+    colors. 32 bits keeps the exact float32 values of float colors
+    in a 16 byte void key."""
+    if bits == 8:
+        quantized = np.rint(colors * 255).astype(np.uint8)
+        # NOTE: Reinterpret the 4 channels of each row as one integer
+        return np.ascontiguousarray(quantized).view(np.uint32).ravel()
+    # NOTE: Adding zero turns -0.0 into 0.0 so they share a key
+    colors = np.ascontiguousarray(colors, dtype=np.float32) + np.float32(0.0)
+    halves = colors.view(np.uint64).astype('>u8')
+    return halves.view(FLOAT_KEY_TYPE).ravel()
+
+
+def argsort_keys(keys: np.ndarray) -> np.ndarray:
+    """Sort order of color keys, consistent with `numpy.searchsorted`.
+
+    Void keys are compared byte by byte which is slow, sorting
+    by their low then high half gives the same order faster."""
+    if keys.dtype != FLOAT_KEY_TYPE:
+        return np.argsort(keys)
+    halves = keys.view('>u8').reshape(-1, 2).astype(np.uint64)
+    # NOTE: Keys from `factorize` are already sorted
+    high, low = halves[:, 0], halves[:, 1]
+    if np.all((high[1:] > high[:-1])
+              | ((high[1:] == high[:-1]) & (low[1:] >= low[:-1]))):
+        return np.arange(len(keys))
+    order = np.argsort(low)
+    return order[np.argsort(high[order], kind='stable')]
+
+
+def factorize(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray,
+                                         np.ndarray, np.ndarray]:
+    """Same result as `numpy.unique` with `return_index`,
+    `return_inverse` and `return_counts`.
+
+    `numpy.unique` needs a stable sort to get first indices, an
+    unstable sort plus a min reduction per group is much faster."""
+    if not len(keys):
+        empty = np.empty(0, dtype=np.intp)
+        return keys[:0], empty, empty, empty
+    order = argsort_keys(keys)
+    sorted_keys = keys[order]
+    group_start = np.empty(len(keys), dtype=bool)
+    group_start[0] = True
+    group_start[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    starts = np.flatnonzero(group_start)
+
+    inverse = np.empty(len(keys), dtype=np.intp)
+    inverse[order] = np.cumsum(group_start) - 1
+    first = np.minimum.reduceat(order, starts)
+    counts = np.diff(np.append(starts, len(keys)))
+    return sorted_keys[starts], first, inverse, counts
+
+
+def get_key_bits(buffer: ColorBuffer) -> int:
+    return 8 if buffer.color_prop == "color_srgb" else 32
+
+
+class ColorHistogram:
+    """Every distinct color of a `ColorBuffer` and how many
+    elements (corners or vertices) use it.
+
+    Built in one sorting pass over packed color keys.
+    `colors` are exact values taken from the first element of each
+    bucket so they can be compared against the mesh again.
+
+    Buckets are only ever appended by `add_buckets`, a bucket
+    that empties keeps its index with a count of zero."""
+
+    def __init__(self, colors: np.ndarray, bits: int, keys: np.ndarray,
+                 first: np.ndarray, inverse: np.ndarray, counts: np.ndarray,
+                 sorter: np.ndarray | None=None):
+        self.bits = bits
+        self.keys = keys
+        self.first = first
+        self.inverse = inverse
+        self.counts = counts
+        self.colors = colors
+        self.sorter = argsort_keys(keys) if sorter is None else sorter
+
+    @classmethod
+    def from_buffer(cls, buffer: ColorBuffer):
+        bits = get_key_bits(buffer)
+        keys, first, inverse, counts = \
+            factorize(pack_colors(buffer.colors, bits))
+        return cls(
+            buffer.colors[first], bits, keys, first, inverse, counts
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def find_keys(self, keys: np.ndarray) -> np.ndarray:
+        """Get the bucket index of each key, -1 if there is none."""
+        if not len(self.keys):
+            return np.full(len(keys), -1, dtype=np.intp)
+        idxs = np.searchsorted(self.keys, keys, sorter=self.sorter)
+        buckets = self.sorter[np.minimum(idxs, len(self.keys) - 1)]
+        buckets[self.keys[buckets] != keys] = -1
+        return buckets
+
+    def find(self, color) -> int:
+        """Get the bucket index of a color, -1 if it isn't used."""
+        key = pack_colors(
+            np.asarray([color[:4]], dtype=np.float32), self.bits
+        )
+        bucket = int(self.find_keys(key)[0])
+        if bucket != -1 and not self.counts[bucket]:
+            return -1
+        return bucket
+
+    def add_buckets(self, keys: np.ndarray, colors: np.ndarray,
+                    first: np.ndarray) -> np.ndarray:
+        """Append empty buckets for new keys, returns their indices."""
+        buckets = np.arange(len(self.keys), len(self.keys) + len(keys))
+        self.keys = np.concatenate((self.keys, keys))
+        self.colors = np.concatenate((self.colors, colors))
+        self.first = np.concatenate((self.first, first))
+        self.counts = np.concatenate(
+            (self.counts, np.zeros(len(keys), dtype=self.counts.dtype))
+        )
+        self.sorter = argsort_keys(self.keys)
+        return buckets
+
+    def palette_order(self, sort_type: str='appearance') -> np.ndarray:
+        """Get bucket indices in palette order,
+        excluding empty buckets and blank colors."""
+        if sort_type == 'usage':
+            order = np.lexsort((self.first, -self.counts))
+        elif sort_type == 'hue':
+            # NOTE: Grays first by value, then colors by hue
+            colors_hsv = rgb_to_hsv(self.colors)
+            order = np.lexsort((
+                self.first, colors_hsv[:, 2],
+                colors_hsv[:, 0], colors_hsv[:, 1] > 0
+            ))
+        elif sort_type == 'value':
+            colors_hsv = rgb_to_hsv(self.colors)
+            order = np.lexsort((self.first, colors_hsv[:, 0], colors_hsv[:, 2]))
+        else: # Appearance
+            order = np.argsort(self.first)
+        order = order[self.counts[order] > 0]
+        blank_idx = self.find(BLANK_ARRAY)
+        if blank_idx != -1:
+            order = order[order != blank_idx]
+        return order
+
+
+def get_generation(buffer: ColorBuffer) -> tuple:
+    """Identify the current state of a color attribute.
+
+    The checksum catches edits made outside of the add-on,
+    e.g. painting or undo, that element counts alone miss."""
+    return (
+        buffer.name, buffer.domain, len(buffer), zlib.crc32(buffer.colors)
+    )
+
+
+# NOTE: Unique for every state of every index, used
+# to tell if a palette already shows that state
+_index_revisions = itertools.count()
+
+
+class PaletteIndex:
+    """Inverted index from palette color to the elements using it.
+
+    Elements of each histogram bucket are stored as CSR arrays so
+    outliner operations are a lookup instead of a full mesh scan.
+    The CSR arrays and palette orders are rebuilt lazily
+    after `apply_delta`."""
+
+    def __init__(self, generation: tuple, histogram: ColorHistogram):
+        self.generation = generation
+        self.histogram = histogram
+        self.revision = next(_index_revisions)
+        self._groups = None
+        self._orders = {}
+
+    @property
+    def groups(self) -> tuple[np.ndarray, np.ndarray]:
+        if self._groups is None:
+            self._groups = \
+                group_indices(self.histogram.inverse, len(self.histogram))
+        return self._groups
+
+    def lookup(self, color) -> np.ndarray:
+        """Get the indices of elements using a color."""
+        offsets, elements = self.groups
+        bucket = self.histogram.find(color)
+        if bucket == -1:
+            return elements[:0]
+        return elements[offsets[bucket]:offsets[bucket + 1]]
+
+    def bucket_vertices(self, buffer: ColorBuffer) -> tuple[np.ndarray, np.ndarray]:
+        """Bucket to vertex CSR arrays, every vertex
+        is listed once for each color its elements use."""
+        if not buffer.is_corner:
+            return self.groups
+        # NOTE: Unique (bucket, vertex) pairs sort by bucket first
+        vert_count = buffer.topology.vert_count
+        pairs = np.unique(
+            self.histogram.inverse.astype(np.int64) * vert_count
+            + buffer.loop_vert
+        )
+        buckets, vert_indices = np.divmod(pairs, vert_count)
+        offsets = np.zeros(len(self.histogram) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(buckets, minlength=len(self.histogram)),
+            out=offsets[1:]
+        )
+        return offsets, vert_indices.astype(np.int32)
+
+    def palette_order(self, sort_type: str='appearance') -> np.ndarray:
+        order = self._orders.get(sort_type)
+        if order is None:
+            order = self.histogram.palette_order(sort_type)
+            self._orders[sort_type] = order
+        return order
+
+    def apply_delta(self, buffer: ColorBuffer, elements: np.ndarray) -> None:
+        """Update the index after the given elements of a buffer were
+        written, without rescanning the rest of the mesh.
+
+        Old colors come from the index itself, new colors from the
+        buffer. The index must have been up to date before the write."""
+        if elements.dtype == bool:
+            elements = np.flatnonzero(elements)
+        # NOTE: Index the colors as they'll be stored,
+        # the generation has to match the next read
+        buffer.quantize()
+        histogram = self.histogram
+
+        old_buckets = histogram.inverse[elements]
+        histogram.counts -= \
+            np.bincount(old_buckets, minlength=len(histogram))
+
+        new_colors = buffer.colors[elements]
+        keys, first, inverse, counts = \
+            factorize(pack_colors(new_colors, histogram.bits))
+        buckets = histogram.find_keys(keys)
+        new_keys = buckets == -1
+        if new_keys.any():
+            buckets[new_keys] = histogram.add_buckets(
+                keys[new_keys], new_colors[first[new_keys]],
+                elements[first[new_keys]]
+            )
+        np.add.at(histogram.counts, buckets, counts)
+        # NOTE: A bucket that was emptied and is used again
+        # only has elements of this write
+        refilled = histogram.counts[buckets] == counts
+        element_count = len(histogram.inverse)
+        histogram.first[buckets[refilled]] = element_count
+        histogram.colors[buckets[refilled]] = new_colors[first[refilled]]
+
+        histogram.inverse[elements] = buckets[inverse]
+        # NOTE: Keep `first` the lowest element of every touched
+        # bucket, so appearance order matches a full rebuild
+        np.minimum.at(histogram.first, histogram.inverse[elements], elements)
+        old_buckets = np.unique(old_buckets)
+        old_buckets = old_buckets[histogram.counts[old_buckets] > 0]
+        moved = old_buckets[
+            histogram.inverse[histogram.first[old_buckets]] != old_buckets
+        ]
+        if len(moved):
+            is_moved = np.zeros(len(histogram), dtype=bool)
+            is_moved[moved] = True
+            histogram.first[moved] = element_count
+            moved_elements = np.flatnonzero(is_moved[histogram.inverse])
+            np.minimum.at(
+                histogram.first, histogram.inverse[moved_elements],
+                moved_elements
+            )
+        self.generation = get_generation(buffer)
+        self.revision = next(_index_revisions)
+        self._groups = None
+        self._orders = {}
+
+
+# NOTE: Keyed by mesh `session_uid`, the palette
+# describes the mesh data so it's shared by its users
+_palette_indices: dict[int, PaletteIndex] = {}
+
+
+def build_palette_index(buffer: ColorBuffer) -> PaletteIndex:
+    """Build and store the palette index of a buffer."""
+    index = PaletteIndex(
+        get_generation(buffer), ColorHistogram.from_buffer(buffer)
+    )
+    _palette_indices[buffer.data.session_uid] = index
+    return index
+
+
+def get_palette_index(buffer: ColorBuffer) -> PaletteIndex | None:
+    """Get the stored palette index of a buffer if it is up to date."""
+    index = _palette_indices.get(buffer.data.session_uid)
+    if index is None or index.generation != get_generation(buffer):
+        return None
+    return index
+
+
+def get_stored_palette_index(data: Mesh) -> PaletteIndex | None:
+    """Get the stored palette index of a mesh without validating it,
+    for display purposes where reading the colors is too slow."""
+    return _palette_indices.get(data.session_uid)
+
+
+def get_page_count(color_count: int, page_size: int) -> int:
+    return max(1, -(-color_count // page_size))
+
+
+def format_color_names(colors) -> list[str]:
+    """Format colors as outliner item names, in
+    the RGB or HSV display mode of the scene."""
+    colors = np.asarray(colors, dtype=np.float64).reshape(-1, 4)
+    if bpy.context.scene.color_plus.rgb_hsv_convert_options == 'rgb':
+        item_colors = np.rint(colors[:, :3] * 255).astype(int).tolist()
+    else: # HSV
+        item_colors = [
+            [round(channel) if channel.is_integer() else round(channel, 2)
+             for channel in color_hsv]
+            for color_hsv in rgb_to_hsv(colors[:, :3]).tolist()
+        ]
+    names = []
+    for item_color, alpha_channel in zip(item_colors, colors[:, 3].tolist()):
+        if alpha_channel.is_integer():
+            alpha_channel = round(alpha_channel)
+        else:
+            alpha_channel = round(alpha_channel, 3)
+        names.append("({}, {}, {}, {})".format(*item_color, alpha_channel))
+    return names
+
+
+def lookup_color(buffer: ColorBuffer, color) -> np.ndarray:
+    """Get the indices of elements using a color, from the palette
+    index if it's up to date or a full comparison otherwise."""
+    index = get_palette_index(buffer)
+    if index is None:
+        return np.flatnonzero(buffer.match(color))
+    return index.lookup(color)
+
+
+def remap_colors(buffer: ColorBuffer, sources, targets) -> np.ndarray:
+    """Replace every source color of a buffer with its target color.
+
+    Sources are matched against the palette buckets instead of every
+    element, then all elements are remapped in one gather through the
+    bucket inverse. Remaps don't chain, a color that is both a target
+    and a source is only remapped once. Keeps the palette index up
+    to date, returns the indices of the changed elements."""
+    index = get_palette_index(buffer)
+    if index is None:
+        index = build_palette_index(buffer)
+    histogram = index.histogram
+
+    sources = np.asarray(sources, dtype=np.float32).reshape(-1, 4)
+    targets = np.asarray(targets, dtype=np.float32).reshape(-1, 4)
+    buckets = histogram.find_keys(pack_colors(sources, histogram.bits))
+    found = buckets != -1
+    bucket_targets = np.full(len(histogram), -1, dtype=np.intp)
+    bucket_targets[buckets[found]] = np.flatnonzero(found)
+
+    element_targets = bucket_targets[histogram.inverse]
+    elements = np.flatnonzero(element_targets != -1)
+    if len(elements):
+        buffer.colors[elements] = targets[element_targets[elements]]
+        index.apply_delta(buffer, elements)
+    return elements
+
+
+def parse_remap_color(value) -> list[float]:
+    """Parse an RGB(A) list or a hex string, alpha defaults to 1."""
+    if isinstance(value, str):
+        value = value.strip().lstrip('#')
+        if len(value) not in (6, 8):
+            raise ValueError(f"Invalid hex color '{value}'")
+        value = [int(value[idx:idx + 2], 16) / 255
+                 for idx in range(0, len(value), 2)]
+    color = [float(channel) for channel in value]
+    if len(color) == 3:
+        color.append(1.0)
+    if len(color) != 4:
+        raise ValueError(f"Invalid color {value}")
+    return color
+
+
+def read_remap_table(filepath: str) -> tuple[np.ndarray, np.ndarray]:
+    """Read source and target colors from a JSON or CSV file.
+
+    JSON files hold a list of `[source, target]` pairs or objects with
+    `source` and `target` keys. CSV rows hold two hex colors or two
+    RGB(A) colors as 6 or 8 numbers, rows that aren't colors (e.g.
+    headers) are skipped. Values use the same 0-1 range as the
+    Palette Outliner."""
+    pairs = []
+    if filepath.lower().endswith('.json'):
+        with open(filepath, encoding='utf-8') as file:
+            for entry in json.load(file):
+                if isinstance(entry, dict):
+                    entry = (entry['source'], entry['target'])
+                source, target = entry
+                pairs.append(
+                    (parse_remap_color(source), parse_remap_color(target))
+                )
+    else: # CSV
+        with open(filepath, newline='', encoding='utf-8') as file:
+            for row in csv.reader(file):
+                row = [cell for cell in row if cell.strip()]
+                if len(row) not in (2, 6, 8):
+                    continue
+                try:
+                    if len(row) == 2:
+                        source, target = row
+                    else:
+                        half = len(row) // 2
+                        source, target = row[:half], row[half:]
+                    pairs.append(
+                        (parse_remap_color(source), parse_remap_color(target))
+                    )
+                except ValueError:
+                    continue
+    if not pairs:
+        raise ValueError("No colors found in the remap table")
+    colors = np.clip(np.array(pairs, dtype=np.float32), 0, 1)
+    return colors[:, 0], colors[:, 1]
+
+
+class PaletteScan:
+    """Palette index build split into fixed size chunks.
+
+    Each chunk is factorized on its own and merged into the running
+    histogram right away, buckets are numbered in order of appearance.
+    Keys are kept sorted by inserting the new keys of each chunk, so
+    `finish` only has to store the result. The buckets are the same
+    as the ones of `build_palette_index`."""
+
+    def __init__(self, ob: Object, buffer: ColorBuffer, chunk_size: int):
+        self.object_name = ob.name
+        self.session_uid = buffer.data.session_uid
+        self.generation = get_generation(buffer)
+        self.colors = buffer.colors
+        self.bits = get_key_bits(buffer)
+        self.chunk_size = chunk_size
+        self.position = 0
+
+        empty_keys = pack_colors(self.colors[:0], self.bits)
+        self.keys = empty_keys
+        self.first = np.empty(0, dtype=np.intp)
+        self.bucket_colors = self.colors[:0]
+        self.counts = np.empty(0, dtype=np.int64)
+        self.inverse = np.empty(len(self.colors), dtype=np.intp)
+        self.sorted_keys = empty_keys
+        self.sorter = np.empty(0, dtype=np.intp)
+
+    @property
+    def progress(self) -> float:
+        if not len(self.colors):
+            return 1.0
+        return self.position / len(self.colors)
+
+    @property
+    def is_done(self) -> bool:
+        return self.position >= len(self.colors)
+
+    def step(self) -> None:
+        """Factorize the next chunk and merge it."""
+        chunk = self.colors[self.position:self.position + self.chunk_size]
+        chunk_keys, chunk_first, chunk_inverse, chunk_counts = \
+            factorize(pack_colors(chunk, self.bits))
+
+        idxs = np.searchsorted(self.sorted_keys, chunk_keys)
+        found = idxs < len(self.sorted_keys)
+        found[found] = self.sorted_keys[idxs[found]] == chunk_keys[found]
+        buckets = np.empty(len(chunk_keys), dtype=np.intp)
+        buckets[found] = self.sorter[idxs[found]]
+
+        # NOTE: Earlier chunks hold earlier elements, so
+        # only new buckets take their first element here
+        new_keys = ~found
+        new_buckets = np.arange(
+            len(self.keys), len(self.keys) + np.count_nonzero(new_keys)
+        )
+        buckets[new_keys] = new_buckets
+        self.keys = np.concatenate((self.keys, chunk_keys[new_keys]))
+        self.first = np.concatenate(
+            (self.first, chunk_first[new_keys] + self.position)
+        )
+        self.bucket_colors = np.concatenate(
+            (self.bucket_colors, chunk[chunk_first[new_keys]])
+        )
+        self.counts = np.concatenate(
+            (self.counts, np.zeros(len(new_buckets), dtype=np.int64))
+        )
+        self.counts[buckets] += chunk_counts
+        self.inverse[self.position:self.position + len(chunk)] = \
+            buckets[chunk_inverse]
+
+        # NOTE: Chunk keys are sorted, so the insert positions
+        # of the new keys keep the merged keys sorted
+        insert_idxs = idxs[new_keys]
+        self.sorted_keys = \
+            np.insert(self.sorted_keys, insert_idxs, chunk_keys[new_keys])
+        self.sorter = np.insert(self.sorter, insert_idxs, new_buckets)
+        self.position += len(chunk)
+
+    def finish(self) -> PaletteIndex:
+        """Store the merged histogram as the palette index."""
+        while not self.is_done:
+            self.step()
+        histogram = ColorHistogram(
+            self.bucket_colors, self.bits, self.keys,
+            self.first, self.inverse, self.counts, self.sorter
+        )
+        index = PaletteIndex(self.generation, histogram)
+        _palette_indices[self.session_uid] = index
+        return index
+
+
+class COLORPLUS_palette_scans:
+    """Runs `PaletteScan`s from a timer, one chunk per scan per tick.
+
+    The outliner keeps showing the previous palette until a scan is
+    done, the finished index is then stored and synced in one go."""
+    _scans = {}
+
+    @classmethod
+    def start(cls, ob: Object, buffer: ColorBuffer) -> None:
+        """Start the scan of an object, restarting
+        it if the colors changed since it started."""
+        scan = cls._scans.get(ob.name)
+        if scan is not None and scan.generation == get_generation(buffer):
+            return
+        cls._scans[ob.name] = \
+            PaletteScan(ob, buffer, PALETTE_SCAN_CHUNK_SIZE)
+        if not bpy.app.timers.is_registered(palette_scan_timer):
+            bpy.app.timers.register(palette_scan_timer)
+
+    @classmethod
+    def get(cls, ob: Object) -> PaletteScan | None:
+        return cls._scans.get(ob.name)
+
+    @classmethod
+    def cancel(cls, ob: Object | None=None) -> None:
+        if ob is None:
+            cls._scans.clear()
+        else:
+            cls._scans.pop(ob.name, None)
+        tag_view3d_redraw()
+
+    @classmethod
+    def tick(cls) -> float | None:
+        finished = False
+        for name, scan in list(cls._scans.items()):
+            scan.step()
+            if scan.is_done:
+                scan.finish()
+                del cls._scans[name]
+                finished = True
+
+        if finished:
+            with bpy.context.temp_override(**get_view3d_override()):
+                if bpy.context.object is not None:
+                    bpy.ops.color_plus.refresh_palette_outliner()
+        tag_view3d_redraw()
+        if not cls._scans:
+            return None
+        return .01
+
+
+# NOTE: Timers are matched by function identity,
+# bound classmethods are a new object on every access
+def palette_scan_timer() -> float | None:
+    return COLORPLUS_palette_scans.tick()
+
+
+# NOTE: Keyed by object `session_uid`, the palette state each
+# object's outliner items were last synced with
+_synced_palettes: dict[int, tuple] = {}
+
+
+def is_palette_synced(ob: Object, state: tuple) -> bool:
+    return _synced_palettes.get(ob.session_uid) == state
+
+
+def set_palette_synced(ob: Object, state: tuple) -> None:
+    _synced_palettes[ob.session_uid] = state
+
+
+def clear_palette_indices() -> None:
+    _palette_indices.clear()
+    _synced_palettes.clear()
+
+
+def evict_palette_caches(used_uids: set[int]) -> None:
+    """Drop the indices of meshes that aren't in `used_uids`
+    and the synced states of deleted objects."""
+    for session_uid in _palette_indices.keys() - used_uids:
+        del _palette_indices[session_uid]
+    if _synced_palettes:
+        object_uids = {ob.session_uid for ob in bpy.data.objects}
+        for session_uid in _synced_palettes.keys() - object_uids:
+            del _synced_palettes[session_uid]
+
+
+@persistent
+def load_post_handler(_dummy) -> None:
+    COLORPLUS_palette_scans.cancel()
+    clear_palette_indices()
+
+
+##################################
+# REGISTRATION
+##################################
+
+
+def register():
+    bpy.app.handlers.load_post.append(load_post_handler)
+
+def unregister():
+    if load_post_handler in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(load_post_handler)
+    COLORPLUS_palette_scans.cancel()
+    if bpy.app.timers.is_registered(palette_scan_timer):
+        bpy.app.timers.unregister(palette_scan_timer)
+    clear_palette_indices()
+
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
@@ -18,6 +18,7 @@ from bpy.props import (
 )
 
 from .constants import MAX_OUTLINER_ITEM_MSG
+from .live_tweak import COLORPLUS_live_tweak
 
 
 ##################################
@@ -192,10 +193,7 @@ class COLORPLUS_property_group(bpy.types.PropertyGroup):
         # Update selected vertices if live color tweak is on
         if self.live_color_tweak \
         and context.mode in ('EDIT_MESH', 'PAINT_VERTEX'):
-            bpy.ops.color_plus.edit_color(
-                edit_type='apply',
-                variation_value='color_wheel'
-            )
+            COLORPLUS_live_tweak.request('color_wheel')
 
         # Update draw brush in vertex color mode
         bpy.data.brushes["Draw"].color = (
@@ -226,10 +224,7 @@ class COLORPLUS_property_group(bpy.types.PropertyGroup):
         # Update selected vertices if live color tweak is on
         if self.live_color_tweak \
         and context.mode in ('EDIT_MESH', 'PAINT_VERTEX'):
-            bpy.ops.color_plus.edit_color(
-                edit_type='apply',
-                variation_value='value_var'
-            )
+            COLORPLUS_live_tweak.request('value_var')
 
     def update_alpha_variation(self, context: Context):
         """Extension of `update_color_wheel`
@@ -239,14 +234,20 @@ class COLORPLUS_property_group(bpy.types.PropertyGroup):
         # Update selected vertices if live color tweak is on
         if self.live_color_tweak \
         and context.mode in ('EDIT_MESH', 'PAINT_VERTEX'):
-            bpy.ops.color_plus.edit_color(
-                edit_type='apply',
-                variation_value='alpha_var'
-            )
+            COLORPLUS_live_tweak.request('alpha_var')
 
     def palette_update(self, _context: Context):
         bpy.ops.color_plus.refresh_palette_outliner()
 
+    def palette_label_update(self, _context: Context):
+        bpy.ops.color_plus.refresh_palette_outliner(relabel_only=True)
+
+    stage_palette_edits: BoolProperty(
+        name="Stage Edits",
+        description=\
+            "Collect Palette Outliner color changes and apply them all at once with Remap Palette"
+    )
+
     live_color_tweak: BoolProperty(
         name="Live Edit",
         description=\
@@ -272,6 +273,17 @@ class COLORPLUS_property_group(bpy.types.PropertyGroup):
             ('colors_hsv', "HSV", ""),
             ('rgb', "RGB", "")
         ),
+        update=palette_label_update
+    )
+
+    palette_sort: EnumProperty(
+        items=(
+            ('appearance', "Appearance", "Order colors by where they first appear on the mesh"),
+            ('usage', "Usage", "Order colors by how many elements use them"),
+            ('hue', "Hue", "Order colors by hue, with grays first"),
+            ('value', "Value", "Order colors from dark to bright")
+        ),
+        name="Sort",
         update=palette_update
     )
 
@@ -282,7 +294,9 @@ class COLORPLUS_property_group(bpy.types.PropertyGroup):
             ('per_face', "Per Face", ""),
             ('per_vertex', "Per Vertex", ""),
             ('per_point', "Per Point (Face Corner)", ""),
-            ('dirty_color', "Dirty Vertex Colors", "")
+            ('per_mesh_island', "Per Mesh Island", ""),
+            ('dirty_color', "Dirty Vertex Colors", ""),
+            ('ambient_occlusion', "Ambient Occlusion", "")
         ),
         name='Generation Type'
     )
@@ -294,6 +308,36 @@ class COLORPLUS_property_group(bpy.types.PropertyGroup):
         )
     )
 
+    generate_island_cuts: EnumProperty(
+        items=(
+            ('SHARP', "Sharp", "Split islands at sharp edges"),
+            ('SEAM', "Seam", "Split islands at UV seams")
+        ),
+        name='Cut Edges',
+        options={'ENUM_FLAG'}
+    )
+
+    ao_samples: IntProperty(
+        name='Samples',
+        description='Rays cast per vertex or face corner',
+        default=32,
+        min=1,
+        soft_max=256
+    )
+
+    ao_distance: FloatProperty(
+        name='Distance',
+        description='How far away geometry still occludes',
+        default=1.0,
+        min=0.0001,
+        subtype='DISTANCE'
+    )
+
+    ao_scene_occluders: BoolProperty(
+        name='Scene Occluders',
+        description='Let other visible objects occlude the selected objects'
+    )
+
     color_wheel: FloatVectorProperty(
         name="",
         subtype='COLOR_GAMMA',
@@ -480,8 +524,9 @@ class COLORPLUS_property_group(bpy.types.PropertyGroup):
 
 
 class COLORPLUS_collection_property(bpy.types.PropertyGroup):
-    def update_palette_color(self, _context: Context):
-        if [*self.color] == [*self.saved_color]:
+    def update_palette_color(self, context: Context):
+        if [*self.color] == [*self.saved_color] \
+        or context.scene.color_plus.stage_palette_edits:
             return
         bpy.ops.color_plus.change_outliner_color(saved_active_idx=self.id)
 
@@ -494,6 +539,10 @@ class COLORPLUS_collection_property(bpy.types.PropertyGroup):
             )
 
     id: IntProperty()
+    count: IntProperty(
+        name="Count",
+        description="The amount of face corners or vertices using this color"
+    )
     color: FloatVectorProperty(
         name="",
         subtype='COLOR_GAMMA',
@@ -593,11 +642,32 @@ Certain items may still be changed if the code interacts with the outliner direc
     )
 
     max_outliner_items: IntProperty(
-        name="Max Outliner Items",
-        description='The maximum amount of items allowed in the Palette Outliner per object',
+        name="Outliner Page Size",
+        description='The amount of colors shown per page of the Palette Outliner, larger palettes are split into pages',
         default=25,
         min=1,
-        max=100
+        max=1000
+    )
+
+    async_palette_refresh: BoolProperty(
+        name="Background Palette Refresh",
+        description='Build the palette of large meshes in the background instead of blocking the interface',
+        default=True
+    )
+
+    async_palette_threshold: IntProperty(
+        name="Background Refresh Threshold",
+        description='The amount of face corners or vertices above which the palette is built in the background',
+        default=1000000,
+        min=0
+    )
+
+    live_tweak_rate: IntProperty(
+        name="Live Tweak Rate",
+        description='The maximum amount of times per second Live Tweak updates the mesh while dragging a color',
+        default=30,
+        min=1,
+        max=120
     )
 
     def draw(self, context: Context):
@@ -618,8 +688,26 @@ Certain items may still be changed if the code interacts with the outliner direc
 
             box = col.box()
             split = box.split()
-            split.label(text=MAX_OUTLINER_ITEM_MSG + self.max_outliner_items)
+            split.label(text='Refresh Large Palettes in Background')
+            col2 = split.column()
+            col2.prop(self, 'async_palette_refresh')
+            row = col2.row()
+            row.enabled = self.async_palette_refresh
+            row.prop(self, 'async_palette_threshold', text='Threshold')
+
+            col.separator(factor=.5)
+
+            box = col.box()
+            split = box.split()
+            split.label(text=MAX_OUTLINER_ITEM_MSG)
             split.prop(self, 'max_outliner_items')
+
+            col.separator(factor=.5)
+
+            box = col.box()
+            split = box.split()
+            split.label(text='Live Tweak updates per second')
+            split.prop(self, 'live_tweak_rate')
         else: # Keymaps
             COLORPLUS_addon_keymaps.draw_keymap_items(
                 context.window_manager, layout
@@ -641,6 +729,10 @@ classes = (
     COLORPLUS_OT_add_hotkey
 )
 
+def palette_page_update(_self, _context: Context):
+    bpy.ops.color_plus.refresh_palette_outliner()
+
+
 def register():
     for cls in classes:
         bpy.utils.register_class(cls)
@@ -652,6 +744,14 @@ def register():
         IntProperty(
             name='R G B A values for the layer (Renaming does not work)'
         )
+    bpy.types.Object.color_palette_page = \
+        IntProperty(
+            name='Palette Page',
+            description='The page of the palette shown in the Palette Outliner',
+            default=1,
+            min=1,
+            update=palette_page_update
+        )
 
     # Assign keymaps & register
     COLORPLUS_addon_keymaps.new_keymap('Vertex Colors Pie',
@@ -683,6 +783,7 @@ def unregister():
     del bpy.types.Scene.color_plus
     del bpy.types.Object.color_palette
     del bpy.types.Object.color_palette_active
+    del bpy.types.Object.color_palette_page
 
 
 # ##### BEGIN GPL LICENSE BLOCK #####
@@ -0,0 +1,90 @@
+import colorsys
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# NOTE: The add-on package imports bpy, colorspace
+# only needs NumPy so import the module on its own
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import colorspace  # noqa: E402
+
+
+def sample_colors() -> np.ndarray:
+    """Random colors plus grays, black, white and primaries."""
+    rng = np.random.default_rng(0)
+    levels = np.linspace(0.0, 1.0, 5)
+    grays = np.repeat(levels[:, None], 3, axis=1)
+    primaries = np.array([
+        (1, 0, 0), (0, 1, 0), (0, 0, 1),
+        (1, 1, 0), (0, 1, 1), (1, 0, 1),
+        (0.5, 0.25, 0.25), (0.25, 0.5, 0.5)
+    ])
+    grid = np.stack(
+        np.meshgrid(levels, levels, levels), axis=-1
+    ).reshape(-1, 3)
+    return np.concatenate((rng.random((500, 3)), grays, primaries, grid))
+
+
+@pytest.mark.parametrize("convert, reference", (
+    (colorspace.rgb_to_hsv, colorsys.rgb_to_hsv),
+    (colorspace.hsv_to_rgb, colorsys.hsv_to_rgb),
+    (colorspace.rgb_to_hsl, lambda r, g, b: (
+        lambda h, l, s: (h, s, l))(*colorsys.rgb_to_hls(r, g, b))),
+    (colorspace.hsl_to_rgb, lambda h, s, l: colorsys.hls_to_rgb(h, l, s))
+))
+def test_matches_colorsys(convert, reference):
+    colors = sample_colors()
+    expected = np.array([reference(*color) for color in colors.tolist()])
+    assert np.array_equal(convert(colors), expected)
+
+
+@pytest.mark.parametrize("forward, backward", (
+    (colorspace.rgb_to_hsv, colorspace.hsv_to_rgb),
+    (colorspace.rgb_to_hsl, colorspace.hsl_to_rgb),
+    (colorspace.srgb_to_linear, colorspace.linear_to_srgb),
+    (colorspace.linear_to_lab, colorspace.lab_to_linear)
+))
+def test_round_trip(forward, backward):
+    colors = sample_colors()
+    assert np.allclose(backward(forward(colors)), colors, atol=1e-9)
+
+
+def test_gray_and_black_have_no_hue_or_saturation():
+    grays = np.array([(0.0, 0.0, 0.0), (0.5, 0.5, 0.5), (1.0, 1.0, 1.0)])
+    for convert in (colorspace.rgb_to_hsv, colorspace.rgb_to_hsl):
+        converted = convert(grays)
+        assert not np.isnan(converted).any()
+        assert np.array_equal(converted[:, :2], np.zeros((3, 2)))
+
+
+def test_alpha_and_shape_are_kept():
+    colors = np.random.default_rng(1).random((2, 3, 4))
+    converted = colorspace.rgb_to_hsv(colors)
+    assert converted.shape == colors.shape
+    assert np.array_equal(converted[..., 3], colors[..., 3])
+    assert colorspace.hsv_to_rgb((0.0, 0.0, 0.5, 1.0)).tolist() \
+        == [0.5, 0.5, 0.5, 1.0]
+
+
+def test_hsv_distance_wraps_hue():
+    red = (1.0, 0.0, 0.0, 1.0)
+    near_red = colorspace.hsv_to_rgb((0.99, 1.0, 1.0, 1.0))
+    distance = colorspace.color_distance([near_red], red, 'hsv')
+    assert distance[0] == pytest.approx(0.01)
+
+
+@pytest.mark.parametrize("convert, reference", (
+    (colorspace.rgb_to_hsv, colorsys.rgb_to_hsv),
+    (colorspace.hsv_to_rgb, colorsys.hsv_to_rgb)
+))
+def test_hsv_blocks_match_colorsys(convert, reference):
+    """Several blocks, including a partial one, and values
+    outside 0-1 so hues wrap and sectors go negative."""
+    count = colorspace.HSV_BLOCK_SIZE * 2 + 3
+    colors = np.random.default_rng(2).uniform(-2.0, 3.0, (count, 4))
+    expected = np.array([reference(*color) for color in colors[:, :3].tolist()])
+    converted = convert(colors)
+    assert np.array_equal(converted[:, :3], expected)
+    assert np.array_equal(converted[:, 3], colors[:, 3])
@@ -0,0 +1,313 @@
+import zlib
+from functools import cached_property
+
+import numpy as np
+
+import bpy
+from bpy.app.handlers import persistent
+from bpy.types import Mesh
+
+
+class MeshTopology:
+    """Index arrays describing the connectivity of a `Mesh`.
+
+    Adjacency is stored in CSR form, an `offsets` array of size N+1
+    and an `indices` array where the items of element `i` are
+    `indices[offsets[i]:offsets[i+1]]`. CSR arrays are only built
+    the first time they're used."""
+
+    def __init__(self, data: Mesh, loop_vert: np.ndarray, fingerprint: tuple):
+        self.fingerprint = fingerprint
+        self.vert_count = len(data.vertices)
+        self.edge_count = len(data.edges)
+        self.loop_count = len(data.loops)
+        self.face_count = len(data.polygons)
+
+        self.loop_vert = loop_vert
+        self.loop_edge = np.empty(self.loop_count, dtype=np.int32)
+        data.loops.foreach_get("edge_index", self.loop_edge)
+
+        self.face_loop_start = np.empty(self.face_count, dtype=np.int32)
+        data.polygons.foreach_get("loop_start", self.face_loop_start)
+        self.face_loop_total = np.empty(self.face_count, dtype=np.int32)
+        data.polygons.foreach_get("loop_total", self.face_loop_total)
+
+        self.edge_verts = np.empty((self.edge_count, 2), dtype=np.int32)
+        data.edges.foreach_get("vertices", self.edge_verts.ravel())
+
+    @cached_property
+    def loop_face(self) -> np.ndarray:
+        """Face index of every loop."""
+        # NOTE: Face loops are stored contiguously and in face order
+        return np.repeat(
+            np.arange(self.face_count, dtype=np.int32), self.face_loop_total
+        )
+
+    @cached_property
+    def vert_loops(self) -> tuple[np.ndarray, np.ndarray]:
+        """Vertex to loop CSR arrays."""
+        return group_indices(self.loop_vert, self.vert_count)
+
+    @cached_property
+    def edge_faces(self) -> tuple[np.ndarray, np.ndarray]:
+        """Edge to face CSR arrays.
+
+        Every loop is one edge/face pair so this is a grouping of
+        the loop faces by loop edge. Boundary edges have one face
+        and non-manifold edges have more than two."""
+        offsets, loops = group_indices(self.loop_edge, self.edge_count)
+        return offsets, self.loop_face[loops]
+
+    @cached_property
+    def edge_face_count(self) -> np.ndarray:
+        return np.bincount(self.loop_edge, minlength=self.edge_count)
+
+
+def group_indices(keys: np.ndarray, size: int) -> tuple[np.ndarray, np.ndarray]:
+    """Group the indices of `keys` by key value as CSR arrays."""
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=size), out=offsets[1:])
+    indices = np.argsort(keys, kind='stable').astype(np.int32)
+    return offsets, indices
+
+
+def label_components(count: int, a: np.ndarray,
+                     b: np.ndarray) -> np.ndarray:
+    """Label the connected components of `count` elements linked
+    by the pairs `(a[i], b[i])` with array based union-find.
+
+    Every pass hooks the larger root of each unjoined pair to the
+    smaller one, then compresses paths by pointer jumping until every
+    element points to its root. Labels are numbered in order of the
+    lowest element index of each component."""
+    parent = np.arange(count, dtype=np.int64)
+    while True:
+        root_a = parent[a]
+        root_b = parent[b]
+        unjoined = root_a != root_b
+        if not unjoined.any():
+            break
+        a = a[unjoined]
+        b = b[unjoined]
+        root_a = root_a[unjoined]
+        root_b = root_b[unjoined]
+        # NOTE: A root in several pairs hooks to the smallest of them,
+        # a plain write keeps an arbitrary one and a high index hub
+        # would only lose one neighbor per pass
+        np.minimum.at(
+            parent, np.maximum(root_a, root_b), np.minimum(root_a, root_b)
+        )
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+    roots = parent == np.arange(count)
+    return (np.cumsum(roots) - 1)[parent].astype(np.int32)
+
+
+def get_border_loops(topology: MeshTopology, face_select: np.ndarray,
+                     edge_select: np.ndarray, side: str='inner',
+                     rings: int=1) -> np.ndarray:
+    """Get a mask of the loops on a side of the selection border.
+
+    Border edges are selected edges that are boundary edges or have
+    both selected and unselected faces, any amount of faces can share
+    an edge. The band starts at the border vertices and grows by one
+    ring of faces per extra ring, returns the loops of faces on the
+    given side ('inner', 'outer' or 'both') that sit on the band."""
+    loop_face = topology.loop_face
+    loop_face_select = face_select[loop_face].astype(np.int32)
+    selected_face_count = np.bincount(
+        topology.loop_edge, weights=loop_face_select,
+        minlength=topology.edge_count
+    )
+    face_count = topology.edge_face_count
+    border_edges = edge_select & (
+        (face_count == 1)
+        | ((selected_face_count > 0) & (selected_face_count < face_count))
+    )
+
+    band_verts = np.zeros(topology.vert_count, dtype=bool)
+    band_verts[topology.edge_verts[border_edges].ravel()] = True
+
+    if side == 'inner':
+        side_faces = face_select
+    elif side == 'outer':
+        side_faces = ~face_select
+    else: # Both
+        side_faces = np.ones(topology.face_count, dtype=bool)
+
+    # NOTE: Every loop is a vertex/face pair, so scattering through
+    # the loops expands over the vertex to face adjacency
+    band_faces = np.zeros(topology.face_count, dtype=bool)
+    for _ring in range(rings - 1):
+        band_faces[loop_face[band_verts[topology.loop_vert]]] = True
+        band_faces &= side_faces
+        band_verts[topology.loop_vert[band_faces[loop_face]]] = True
+    return side_faces[loop_face] & band_verts[topology.loop_vert]
+
+
+def get_label_border_loops(topology: MeshTopology,
+                           face_labels: np.ndarray) -> np.ndarray:
+    """Get a mask of the loops on the border of their face label.
+
+    An edge is on the border of a label if it's a boundary edge or
+    not all of its faces have that label. Returns the loops of every
+    face that sit on a border vertex of the face's own label."""
+    label_count = int(face_labels.max()) + 1 if len(face_labels) else 0
+    loop_labels = face_labels[topology.loop_face].astype(np.int64)
+
+    # NOTE: Every loop is one edge/face pair, so counting
+    # (edge, label) pairs gives the faces per label of each edge
+    _keys, pair_inverse, pair_counts = np.unique(
+        topology.loop_edge.astype(np.int64) * label_count + loop_labels,
+        return_inverse=True, return_counts=True
+    )
+    edge_face_count = topology.edge_face_count[topology.loop_edge]
+    border_pairs = (pair_counts[pair_inverse.ravel()] < edge_face_count) \
+        | (edge_face_count == 1)
+
+    border_edges = topology.loop_edge[border_pairs]
+    border_labels = loop_labels[border_pairs]
+    border_keys = np.unique(np.concatenate((
+        border_labels * topology.vert_count + topology.edge_verts[border_edges, 0],
+        border_labels * topology.vert_count + topology.edge_verts[border_edges, 1]
+    )))
+    return np.isin(
+        loop_labels * topology.vert_count + topology.loop_vert,
+        border_keys, assume_unique=False
+    )
+
+
+def get_mesh_island_labels(topology: MeshTopology,
+                           cut_edges: np.ndarray | None=None) -> np.ndarray:
+    """Label the faces of every connected mesh part.
+
+    Without cuts these are Blender's loose parts, faces are connected
+    through any shared vertex. An optional mask of cut edges connects
+    faces only across the edges they share that aren't cut, like
+    Blender's delimit options. Labels are numbered in order of the
+    lowest face index of each island."""
+    if cut_edges is None:
+        vert_labels = label_components(
+            topology.vert_count,
+            topology.edge_verts[:, 0], topology.edge_verts[:, 1]
+        )
+        face_labels = vert_labels[topology.loop_vert[topology.face_loop_start]]
+        # NOTE: Renumber the vertex islands by their lowest face
+        _labels, first_face, face_labels = np.unique(
+            face_labels, return_index=True, return_inverse=True
+        )
+        island_order = np.empty(len(first_face), dtype=np.int32)
+        island_order[np.argsort(first_face)] = np.arange(len(first_face))
+        return island_order[face_labels.ravel()]
+
+    # NOTE: Link each face of an edge to the next face of the same edge
+    offsets, edge_faces = topology.edge_faces
+    entry_edge = np.repeat(np.arange(topology.edge_count), np.diff(offsets))
+    linked = entry_edge[:-1] == entry_edge[1:]
+    linked &= ~cut_edges[entry_edge[:-1]]
+    return label_components(
+        topology.face_count, edge_faces[:-1][linked], edge_faces[1:][linked]
+    )
+
+
+# NOTE: Keyed by `ID.session_uid` which is unique
+# per datablock for the lifetime of a session
+_topology_cache: dict[int, MeshTopology] = {}
+
+
+def get_topology(data: Mesh) -> MeshTopology:
+    """Get the cached topology of a `Mesh`, rebuilding it if the
+    topology changed since the last call.
+
+    Requires object mode data."""
+    loop_vert = np.empty(len(data.loops), dtype=np.int32)
+    data.loops.foreach_get("vertex_index", loop_vert)
+    fingerprint = (
+        len(data.vertices), len(data.edges),
+        len(data.loops), len(data.polygons),
+        zlib.crc32(loop_vert)
+    )
+
+    topology = _topology_cache.get(data.session_uid)
+    if topology is None or topology.fingerprint != fingerprint:
+        topology = MeshTopology(data, loop_vert, fingerprint)
+        _topology_cache[data.session_uid] = topology
+    return topology
+
+
+def clear_topology_cache() -> None:
+    _topology_cache.clear()
+
+
+def get_used_mesh_uids() -> set[int]:
+    """Get the session uids of every mesh that has users.
+
+    Cached arrays of other meshes are dead weight, the mesh
+    was deleted or is an orphan waiting to be purged."""
+    return {data.session_uid for data in bpy.data.meshes if data.users}
+
+
+@persistent
+def load_post_handler(_dummy) -> None:
+    clear_topology_cache()
+
+
+@persistent
+def depsgraph_update_post_handler(_scene, depsgraph) -> None:
+    """Evict the cached arrays of every mesh that has no users,
+    for all of the add-on's per mesh caches at once."""
+    if not depsgraph.id_type_updated('MESH'):
+        return
+    # NOTE: Imported here, both modules import this one
+    from .palette import evict_palette_caches
+    from .uv_islands import evict_uv_island_cache
+
+    used_uids = get_used_mesh_uids()
+    for session_uid in _topology_cache.keys() - used_uids:
+        del _topology_cache[session_uid]
+    evict_palette_caches(used_uids)
+    evict_uv_island_cache(used_uids)
+
+
+##################################
+# REGISTRATION
+##################################
+
+
+def register():
+    bpy.app.handlers.load_post.append(load_post_handler)
+    bpy.app.handlers.depsgraph_update_post.append(
+        depsgraph_update_post_handler
+    )
+
+def unregister():
+    if load_post_handler in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(load_post_handler)
+    if depsgraph_update_post_handler in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(
+            depsgraph_update_post_handler
+        )
+    clear_topology_cache()
+
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
@@ -7,7 +7,12 @@ from bpy.types import Panel, UIList, Menu
 
 from .preferences import COLORPLUS_PT_presets
 from .functions import get_active_color
-from .constants import MAX_OUTLINER_ITEM_MSG
+from .palette import (
+    get_stored_palette_index,
+    get_page_count,
+    COLORPLUS_palette_scans
+)
+from .ambient_occlusion import COLORPLUS_ao_bakes
 
 
 ######################################
@@ -250,7 +255,9 @@ class COLORPLUS_UL_items(UIList):
 
         split = layout.split(factor=.025)
         split.label(text="")
+        split = split.split(factor=.75)
         split.label(text=item.name)
+        split.label(text=str(item.count))
 
 
 class COLORPLUS_PT_palette_outliner(PanelInfo, Panel):
@@ -279,7 +286,18 @@ class COLORPLUS_PT_palette_outliner(PanelInfo, Panel):
         col = layout.column(align=True)
         col.scale_y = 1.2
         col.operator("color_plus.refresh_palette_outliner",
-                     text='Refresh Palette', icon='FILE_REFRESH')
+                     text='Refresh Palette',
+                     icon='FILE_REFRESH').full_refresh = True
+
+        palette_scan = COLORPLUS_palette_scans.get(ob)
+        if palette_scan is not None:
+            row = col.row(align=True)
+            row.scale_y = .8
+            row.label(
+                text=f"Refreshing palette... {round(palette_scan.progress * 100)}%",
+                icon='TIME'
+            )
+            row.operator("color_plus.cancel_palette_scan", text="", icon='X')
 
         row = layout.row()
         col = row.column(align=True)
@@ -291,12 +309,17 @@ class COLORPLUS_PT_palette_outliner(PanelInfo, Panel):
                           "color_palette_active",
                           rows=4)
 
-        max_outliner_items = preferences.max_outliner_items
-        if len(ob.color_palette) >= max_outliner_items:
-            box = col.box()
-            box.scale_y = .8
-            box.label(text=MAX_OUTLINER_ITEM_MSG + f" ({max_outliner_items})",
-                      icon='ERROR')
+        index = get_stored_palette_index(ob.data)
+        if index is not None:
+            color_count = \
+                len(index.palette_order(context.scene.color_plus.palette_sort))
+            page_count = \
+                get_page_count(color_count, preferences.max_outliner_items)
+            if page_count > 1:
+                row2 = col.row(align=True)
+                row2.scale_y = .95
+                row2.prop(ob, 'color_palette_page', text='Page')
+                row2.label(text=f"of {page_count} ({color_count} colors)")
 
         if len(context.selected_objects) > 1:
             box = col.box()
@@ -309,6 +332,26 @@ class COLORPLUS_PT_palette_outliner(PanelInfo, Panel):
         row2.prop(context.scene.color_plus,
                   'rgb_hsv_convert_options',
                   expand=True)
+        row2 = col.row(align=True)
+        row2.scale_y = .95
+        row2.enabled = not disable_ui
+        row2.prop(context.scene.color_plus,
+                  'palette_sort',
+                  expand=True)
+        row2 = col.row(align=True)
+        row2.scale_y = .95
+        row2.enabled = not disable_ui
+        row2.operator("color_plus.convert_palette_to_vertex_groups",
+                      text='All Colors to Vertex Groups', icon='GROUP_VERTEX')
+        row2 = col.row(align=True)
+        row2.scale_y = .95
+        row2.prop(context.scene.color_plus, 'stage_palette_edits', toggle=True)
+        sub = row2.row(align=True)
+        sub.enabled = context.scene.color_plus.stage_palette_edits
+        sub.operator("color_plus.remap_palette",
+                     text='Apply Edits', icon='CHECKMARK').source = 'outliner'
+        row2.operator("color_plus.remap_palette",
+                      text='', icon='FILEBROWSER').source = 'file'
 
         col = row.column(align=True)
         col.enabled = not disable_ui
@@ -551,10 +594,12 @@ class COLORPLUS_PT_color_generation(PanelInfo, Panel):
         col = layout.column(align=True)
         col.scale_y = 1.3
 
-        if color_plus.generate != 'dirty_color':
-            col.operator('color_plus.generate_color', icon='GROUP_VCOL')
-        else:
+        if color_plus.generate == 'dirty_color':
             col.operator('color_plus.dirty_vertex_color', icon='GROUP_VCOL')
+        elif color_plus.generate == 'ambient_occlusion':
+            col.operator('color_plus.bake_ambient_occlusion', icon='GROUP_VCOL')
+        else:
+            col.operator('color_plus.generate_color', icon='GROUP_VCOL')
 
         row = col.row(align=True)
         row.scale_y = .8
@@ -566,6 +611,44 @@ class COLORPLUS_PT_color_generation(PanelInfo, Panel):
             row = col.row()
             row.scale_y = .8
             row.prop(color_plus, 'generate_per_uv_border', expand=True)
+        elif color_plus.generate == 'per_mesh_island':
+            col.separator()
+
+            row = col.row()
+            row.scale_y = .8
+            row.prop(color_plus, 'generate_island_cuts', expand=True)
+        elif color_plus.generate == 'ambient_occlusion':
+            col.separator()
+
+            col.prop(color_plus, 'ao_samples')
+            col.prop(color_plus, 'ao_distance')
+            col.prop(color_plus, 'ao_scene_occluders')
+
+            ao_bake = None if context.object is None \
+                else COLORPLUS_ao_bakes.get(context.object)
+            if ao_bake is not None:
+                row = col.row(align=True)
+                row.scale_y = .8
+                row.label(
+                    text=f"Baking AO... {round(ao_bake.progress * 100)}%",
+                    icon='TIME'
+                )
+                row.operator("color_plus.cancel_ao_bake", text="", icon='X')
+
+
+class COLORPLUS_PT_vertex_groups(PanelInfo, Panel):
+    bl_label = 'Vertex Groups'
+    bl_parent_id = 'COLORPLUS_PT_ui'
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        col = layout.column(align=True)
+        col.scale_y = 1.3
+        col.operator('color_plus.convert_channels_to_vertex_groups',
+                     text='Channels to Vertex Groups', icon='GROUP_VERTEX')
+        col.operator('color_plus.vertex_group_to_color',
+                     text='Vertex Groups to Color', icon='GROUP_VCOL')
 
 
 class COLORPLUS_MT_pie_menu(Menu):
@@ -702,6 +785,7 @@ classes = (
     COLORPLUS_PT_palette_outliner,
     COLORPLUS_PT_custom_palette,
     COLORPLUS_PT_color_generation,
+    COLORPLUS_PT_vertex_groups,
     COLORPLUS_PT_bake_to_vertex_color,
     COLORPLUS_MT_pie_menu
 )
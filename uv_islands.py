@@ -0,0 +1,107 @@
+import zlib
+
+import numpy as np
+
+import bpy
+from bpy.app.handlers import persistent
+from bpy.types import Mesh
+
+from .topology import get_topology, label_components
+from .constants import UV_WELD_EPSILON
+
+
+def get_uv_island_labels(data: Mesh, uv_map: str | None=None,
+                         epsilon: float=UV_WELD_EPSILON) -> np.ndarray | None:
+    """Get the UV island index of every face of a `Mesh`,
+    None if it has no UV map. Uses the active UV map by default.
+
+    Face corners sharing a vertex and a UV position (within
+    `epsilon`) are welded, faces with welded corners are in the
+    same island. Labels are cached until the UVs or topology change.
+
+    Requires object mode data."""
+    uv_layer = \
+        data.uv_layers.active if uv_map is None else data.uv_layers.get(uv_map)
+    if uv_layer is None:
+        return None
+
+    topology = get_topology(data)
+    uvs = np.empty((topology.loop_count, 2), dtype=np.float32)
+    uv_layer.data.foreach_get("uv", uvs.ravel())
+    fingerprint = (topology.fingerprint, epsilon, zlib.crc32(uvs))
+
+    cache_key = (data.session_uid, uv_layer.name)
+    cached = _uv_island_cache.get(cache_key)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+
+    # NOTE: Sort corners by vertex then UV cell, every run of equal
+    # keys is one welded corner and links all of its faces
+    cells = np.rint(uvs / epsilon).astype(np.int64)
+    order = np.lexsort((cells[:, 1], cells[:, 0], topology.loop_vert))
+    sorted_cells = cells[order]
+    weld_start = np.ones(len(order), dtype=bool)
+    weld_start[1:] = \
+        (topology.loop_vert[order[1:]] != topology.loop_vert[order[:-1]]) \
+        | (sorted_cells[1:] != sorted_cells[:-1]).any(axis=1)
+
+    sorted_faces = topology.loop_face[order]
+    weld_faces = sorted_faces[weld_start]
+    linked_faces = weld_faces[np.cumsum(weld_start) - 1]
+    labels = label_components(topology.face_count, sorted_faces, linked_faces)
+
+    _uv_island_cache[cache_key] = (fingerprint, labels)
+    return labels
+
+
+# NOTE: Keyed by mesh `session_uid` and UV map name
+_uv_island_cache: dict[tuple[int, str], tuple[tuple, np.ndarray]] = {}
+
+
+def clear_uv_island_cache() -> None:
+    _uv_island_cache.clear()
+
+
+def evict_uv_island_cache(used_uids: set[int]) -> None:
+    """Drop the labels of meshes that aren't in `used_uids`."""
+    for cache_key in list(_uv_island_cache):
+        if cache_key[0] not in used_uids:
+            del _uv_island_cache[cache_key]
+
+
+@persistent
+def load_post_handler(_dummy) -> None:
+    clear_uv_island_cache()
+
+
+##################################
+# REGISTRATION
+##################################
+
+
+def register():
+    bpy.app.handlers.load_post.append(load_post_handler)
+
+def unregister():
+    if load_post_handler in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(load_post_handler)
+    clear_uv_island_cache()
+
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
@@ -0,0 +1,112 @@
+from math import pi
+
+import numpy as np
+
+from bpy.types import Mesh
+
+from .topology import MeshTopology
+
+
+def vert_neighbor_sum(topology: MeshTopology, values: np.ndarray) -> np.ndarray:
+    """Sum the values of the edge neighbors of every vertex.
+
+    The same as multiplying by the sparse vertex adjacency matrix,
+    each edge adds its values to both of its vertices."""
+    edge_verts = topology.edge_verts
+    return np.bincount(
+        edge_verts.ravel(), weights=values[edge_verts[:, ::-1]].ravel(),
+        minlength=topology.vert_count
+    )
+
+
+def get_vertex_dirt(data: Mesh, topology: MeshTopology,
+                    blur_strength: float=1.0, blur_iterations: int=1,
+                    clean_angle: float=pi, dirt_angle: float=0.0,
+                    dirt_only: bool=False,
+                    normalize: bool=True) -> np.ndarray:
+    """Get the dirt tone of every vertex, 0 is the dirtiest.
+
+    Follows Blender's Dirty Vertex Colors operator: the tone is the
+    angle between the vertex normal and the average direction to its
+    edge neighbors, so concave vertices are dark. Tones are clamped
+    to the dirt/clean angles, blurred over the edges and mapped to
+    the 0-1 range.
+
+    Requires object mode data."""
+    vert_count = topology.vert_count
+    coords = np.empty((vert_count, 3), dtype=np.float32)
+    data.vertices.foreach_get("co", coords.ravel())
+    normals = np.empty((vert_count, 3), dtype=np.float32)
+    data.vertex_normals.foreach_get("vector", normals.ravel())
+    coords = coords.astype(np.float64)
+    normals = normals.astype(np.float64)
+
+    edge_verts = topology.edge_verts
+    directions = coords[edge_verts[:, 1]] - coords[edge_verts[:, 0]]
+    lengths = np.linalg.norm(directions, axis=1)
+    # NOTE: Zero length edges have no direction, like `Vector.normalized`
+    np.divide(
+        directions, lengths[:, None], out=directions,
+        where=lengths[:, None] > 0.0
+    )
+    neighbor_count = np.bincount(edge_verts.ravel(), minlength=vert_count)
+
+    average_direction = np.empty((vert_count, 3))
+    for axis in range(3):
+        average_direction[:, axis] = \
+            np.bincount(
+                edge_verts[:, 0], weights=directions[:, axis],
+                minlength=vert_count
+            ) - np.bincount(
+                edge_verts[:, 1], weights=directions[:, axis],
+                minlength=vert_count
+            )
+    average_direction /= np.maximum(neighbor_count, 1)[:, None]
+
+    # NOTE: Above 90 degrees is convex, vertices
+    # without neighbors are considered flat
+    tones = np.arccos(np.clip(
+        np.einsum('ij,ij->i', normals, average_direction), -1.0, 1.0
+    ))
+    tones[neighbor_count == 0] = pi / 2.0
+    np.maximum(tones, dirt_angle, out=tones)
+    if not dirt_only:
+        np.minimum(tones, clean_angle, out=tones)
+
+    blur_weight = neighbor_count * blur_strength + 1.0
+    for _iteration in range(blur_iterations):
+        tones = (tones + blur_strength * vert_neighbor_sum(topology, tones)) \
+            / blur_weight
+
+    if normalize and vert_count:
+        min_tone = tones.min()
+        max_tone = tones.max()
+    else:
+        min_tone = dirt_angle
+        max_tone = clean_angle
+    tone_range = max_tone - min_tone
+    # NOTE: A flat range leaves every tone at zero instead of failing
+    tone_scale = 0.0 if tone_range < 0.0001 else 1.0 / tone_range
+    tones = (tones - min_tone) * tone_scale
+    if dirt_only:
+        tones = np.minimum(tones, 0.5) * 2.0
+    return tones
+
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
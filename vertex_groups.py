@@ -0,0 +1,139 @@
+import numpy as np
+
+import bpy
+from bpy.types import VertexGroup, Object, Context, NodeTree
+
+from .topology import group_indices
+from .constants import VERTEX_WEIGHT_STEPS
+
+
+# NOTE: Attribute names starting with a dot are hidden in the UI
+WEIGHT_ATTRIBUTE_PREFIX = ".color_plus_weight_"
+
+
+def set_vertex_group_weights(vgroup: VertexGroup, weights: np.ndarray,
+                             steps: int=VERTEX_WEIGHT_STEPS) -> None:
+    """Assign a weight to every vertex of a vertex group.
+
+    `VertexGroup.add` takes one weight for any amount of vertices,
+    so weights are quantized to `steps` levels and each level is
+    added in a single call. Vertices with a weight of zero are
+    not added to the group."""
+    levels = np.rint(np.clip(weights, 0.0, 1.0) * steps).astype(np.int32)
+    offsets, vert_indices = group_indices(levels, steps + 1)
+    used_levels = np.flatnonzero(np.diff(offsets)[1:]) + 1
+    for level in used_levels.tolist():
+        vgroup.add(
+            vert_indices[offsets[level]:offsets[level + 1]].tolist(),
+            level / steps, 'REPLACE'
+        )
+
+
+def get_enabled_socket(sockets, name: str):
+    """Get a socket by name, skipping the unused
+    sockets of other data types."""
+    return next(
+        socket for socket in sockets if socket.name == name and socket.enabled
+    )
+
+
+def new_weights_node_group(names: list[str]) -> NodeTree:
+    """Create a geometry node group that stores the weights
+    of each vertex group in a float point attribute."""
+    node_group = bpy.data.node_groups.new(
+        ".Color Plus Weights", 'GeometryNodeTree'
+    )
+    if bpy.app.version < (4, 0, 0):
+        node_group.inputs.new('NodeSocketGeometry', "Geometry")
+        node_group.outputs.new('NodeSocketGeometry', "Geometry")
+    else:
+        node_group.interface.new_socket(
+            "Geometry", in_out='INPUT', socket_type='NodeSocketGeometry'
+        )
+        node_group.interface.new_socket(
+            "Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry'
+        )
+
+    nodes = node_group.nodes
+    links = node_group.links
+    geometry = nodes.new('NodeGroupInput').outputs[0]
+    for idx, name in enumerate(names):
+        named_attribute = nodes.new('GeometryNodeInputNamedAttribute')
+        named_attribute.data_type = 'FLOAT'
+        named_attribute.inputs["Name"].default_value = name
+
+        store_attribute = nodes.new('GeometryNodeStoreNamedAttribute')
+        store_attribute.data_type = 'FLOAT'
+        store_attribute.domain = 'POINT'
+        store_attribute.inputs["Name"].default_value = \
+            f"{WEIGHT_ATTRIBUTE_PREFIX}{idx}"
+
+        links.new(geometry, store_attribute.inputs[0])
+        links.new(
+            get_enabled_socket(named_attribute.outputs, "Attribute"),
+            get_enabled_socket(store_attribute.inputs, "Value")
+        )
+        geometry = store_attribute.outputs[0]
+    links.new(geometry, nodes.new('NodeGroupOutput').inputs[0])
+    return node_group
+
+
+def get_vertex_group_weights(context: Context, ob: Object,
+                             names: list[str]) -> np.ndarray:
+    """Get the weights of vertex groups as a `(V, len(names))` array,
+    vertices outside of a group have a weight of zero.
+
+    Weights are only exposed per vertex in the Python API, so a
+    temporary geometry nodes modifier copies them to attributes
+    that are read from the evaluated mesh with `foreach_get`.
+    Other modifiers are disabled meanwhile so vertex indices
+    line up with the original mesh.
+
+    Requires object mode."""
+    weights = np.zeros((len(ob.data.vertices), len(names)), dtype=np.float32)
+    if not names:
+        return weights
+
+    saved_modifiers = [(mod, mod.show_viewport) for mod in ob.modifiers]
+    for mod, _show_viewport in saved_modifiers:
+        mod.show_viewport = False
+    node_group = new_weights_node_group(names)
+    modifier = ob.modifiers.new(name="Color Plus Weights", type='NODES')
+    modifier.node_group = node_group
+    try:
+        ob_eval = ob.evaluated_get(context.evaluated_depsgraph_get())
+        data_eval = ob_eval.to_mesh()
+        channel = np.empty(len(weights), dtype=np.float32)
+        for idx in range(len(names)):
+            attribute = \
+                data_eval.attributes.get(f"{WEIGHT_ATTRIBUTE_PREFIX}{idx}")
+            if attribute is None or len(attribute.data) != len(weights):
+                continue
+            attribute.data.foreach_get("value", channel)
+            weights[:, idx] = channel
+        ob_eval.to_mesh_clear()
+    finally:
+        ob.modifiers.remove(modifier)
+        bpy.data.node_groups.remove(node_group)
+        for mod, show_viewport in saved_modifiers:
+            mod.show_viewport = show_viewport
+    return weights
+
+
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####